@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Astro content store for the Telegram Travel Bot.
+Loads every zodiac description and photo into memory at startup; photo
+file_ids are kept in the media registry, so /astro needs no disk I/O and
+uploads each photo only once.
+"""
+
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+from telegram import Bot, Message
+
+from media_registry import media_registry
+from zodiac import LEXICONS, SIGN_NAMES
+
+# === Logging ===
+logger = logging.getLogger(__name__)
+
+# === Constants ===
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TEXT_DIR = os.path.join(BASE_DIR, 'astro_descr')  # astro_descr/<sign>/<gender>[.txt]
+PHOTO_DIR = os.path.join(BASE_DIR, 'astra_photo')  # astra_photo/<Sign>_<gender>.jpg
+
+GENDERS = tuple(LEXICONS)
+
+ContentKey = Tuple[str, str]
+
+
+def _key(sign: str, gender: str) -> ContentKey:
+    # File names on disk mix 'Gemini', 'gemini' and 'libra', so compare lowercase
+    return sign.lower(), gender.lower()
+
+
+class AstroContentStore:
+    """In-memory descriptions and photos for every (sign, gender) pair."""
+
+    def __init__(self, text_dir: str = TEXT_DIR, photo_dir: str = PHOTO_DIR):
+        self.text_dir = text_dir
+        self.photo_dir = photo_dir
+        self.texts: Dict[ContentKey, str] = {}
+        self.photos: Dict[ContentKey, bytes] = {}
+        # Asset path of each photo, as used by the media registry
+        self.photo_paths: Dict[ContentKey, str] = {}
+        self.missing: List[str] = []
+
+    def load(self) -> None:
+        """Read all texts and photos and check that every combination exists."""
+        self.texts.clear()
+        self.photos.clear()
+        self.photo_paths.clear()
+
+        if os.path.isdir(self.text_dir):
+            for sign_dir in os.listdir(self.text_dir):
+                sign_path = os.path.join(self.text_dir, sign_dir)
+                if not os.path.isdir(sign_path):
+                    continue
+                for filename in os.listdir(sign_path):
+                    gender = os.path.splitext(filename)[0]
+                    with open(os.path.join(sign_path, filename), 'r', encoding='utf-8') as f:
+                        self.texts[_key(sign_dir, gender)] = f.read()
+
+        if os.path.isdir(self.photo_dir):
+            for filename in os.listdir(self.photo_dir):
+                stem, ext = os.path.splitext(filename)
+                if ext.lower() != '.jpg' or '_' not in stem:
+                    continue
+                sign, gender = stem.rsplit('_', 1)
+                photo_path = os.path.join(self.photo_dir, filename)
+                with open(photo_path, 'rb') as f:
+                    self.photos[_key(sign, gender)] = f.read()
+                self.photo_paths[_key(sign, gender)] = os.path.relpath(photo_path, BASE_DIR)
+
+        self.missing = []
+        for sign in SIGN_NAMES.values():
+            for gender in GENDERS:
+                key = _key(sign, gender)
+                if key not in self.texts:
+                    self.missing.append(f"text {sign}/{gender}")
+                if key not in self.photos:
+                    self.missing.append(f"photo {sign}_{gender}")
+
+        if self.missing:
+            logger.warning(f"Missing astro content: {', '.join(self.missing)}")
+        logger.info(f"Loaded {len(self.texts)} astro texts and {len(self.photos)} photos")
+
+    def text(self, sign: str, gender: str) -> Optional[str]:
+        """Get the description for a sign and gender."""
+        return self.texts.get(_key(sign, gender))
+
+    async def send_photo(self, bot: Bot, chat_id: int, sign: str, gender: str) -> Optional[Message]:
+        """
+        Send the photo for a sign and gender through the media registry.
+
+        The photo goes by its stored file_id when there is one; the first
+        upload (or a re-upload after Telegram rejects a stale file_id) uses
+        the bytes already in memory.
+
+        Returns:
+            The sent message, or None if there is no photo for this pair
+        """
+        key = _key(sign, gender)
+        path = self.photo_paths.get(key)
+        if path is None:
+            return None
+        return await media_registry.send_photo(bot, chat_id, path, data=self.photos[key])
+
+    def assets(self) -> Dict[str, str]:
+        """Photo asset paths for media registry warm-up."""
+        return {path: 'photo' for path in self.photo_paths.values()}
+
+
+astro_store = AstroContentStore()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the /food HTML extraction.
+Compares the original full-tree html.parser extraction with the scoped
+extraction in food_parsing.py over a directory of .html pages. Both must
+return the same dishes for every page before anything is timed.
+
+The pages in bench_pages/ are synthetic: generated offline in the
+Wikipedia "Cuisine of ..." layout (mw-content-text, [edit] spans,
+footnotes, ~200 KB each), not saved Wikipedia pages. They are named
+synthetic_*.html so dish_index.py never indexes them; for real numbers
+point the benchmark at a folder of saved Cuisine_of_*.html pages:
+
+    python bench_food.py --repeat 5
+    python bench_food.py saved_pages/ --repeat 5
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+import food_parsing
+from food_parsing import parse_dishes_sections
+
+
+def legacy_parse_dishes_sections(html, max_items=5):
+    # исходная версия: полное дерево html.parser, regex на каждый пункт, дедупликация списком
+    soup = BeautifulSoup(html, 'html.parser')
+    content = soup.find(id='mw-content-text')
+    if not content:
+        return []
+
+    items = []
+    relevant_sections = ["dish", "food", "cuisine", "meal", "recipe",
+                         "specialty", "appetizer", "dessert", "snack"]
+
+    for header in content.find_all(['h2', 'h3', 'h4']):
+        heading_text = header.get_text(separator=" ", strip=True)
+        heading_text_clean = re.sub(r'\[edit\]', '', heading_text, flags=re.I).lower()
+
+        if any(keyword in heading_text_clean for keyword in relevant_sections):
+            for sibling in header.find_next_siblings():
+                if sibling.name and sibling.name.startswith('h') and len(sibling.name) <= len(header.name):
+                    break
+                if sibling.name == 'ul':
+                    for li in sibling.find_all('li', recursive=False):
+                        text = li.get_text(separator=' ', strip=True)
+                        text = re.sub(r'\[\d+\]', '', text)
+                        word_count = len(text.split())
+                        if 1 <= word_count <= 7:
+                            items.append(text)
+                if len(items) >= max_items * 2:
+                    break
+            if len(items) >= max_items * 2:
+                break
+
+    unique_items = []
+    for item in items:
+        if item not in unique_items:
+            unique_items.append(item)
+        if len(unique_items) >= max_items:
+            break
+    return unique_items
+
+
+def best_time(parser, html, repeat):
+    # лучшее время из нескольких прогонов, в миллисекундах
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = parser(html)
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000, result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('directory', nargs='?', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_pages'),
+                            help="directory with .html pages (default: synthetic bench_pages/)")
+    arg_parser.add_argument('--repeat', type=int, default=3, help="runs per page (best is reported)")
+    arg_parser.add_argument('--parser', choices=('lxml', 'html.parser'),
+                            help="backend for the new extraction (default: lxml if installed)")
+    args = arg_parser.parse_args()
+    if args.parser:
+        food_parsing.HTML_PARSER = args.parser
+
+    pages = []
+    for name in sorted(os.listdir(args.directory)):
+        if name.endswith('.html'):
+            with open(os.path.join(args.directory, name), 'r', encoding='utf-8') as f:
+                pages.append((name, f.read()))
+    if not pages:
+        print(f"В {args.directory} нет .html файлов")
+        return 1
+
+    # сначала проверяем, что новая версия находит ровно те же блюда
+    mismatches = 0
+    for name, html in pages:
+        legacy, new = legacy_parse_dishes_sections(html), parse_dishes_sections(html)
+        if legacy != new:
+            mismatches += 1
+            print(f"{name}: результаты различаются\n  legacy: {legacy}\n  new:    {new}")
+    if mismatches:
+        return 1
+
+    print(f"Парсер food_parsing.py: {food_parsing.HTML_PARSER}")
+    print(f"{'page':40} {'KB':>6} {'legacy ms':>10} {'new ms':>10} {'speedup':>8}  dishes")
+    total_legacy = total_new = 0.0
+    for name, html in pages:
+        legacy_ms, _ = best_time(legacy_parse_dishes_sections, html, args.repeat)
+        new_ms, dishes = best_time(parse_dishes_sections, html, args.repeat)
+        total_legacy += legacy_ms
+        total_new += new_ms
+        print(f"{name[:40]:40} {len(html) // 1024:6} {legacy_ms:10.1f} {new_ms:10.1f} "
+              f"{legacy_ms / new_ms:7.1f}x  {len(dishes)}")
+
+    print(f"{'total':40} {'':6} {total_legacy:10.1f} {total_new:10.1f} {total_legacy / total_new:7.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,353 @@
+"""
+Тест «Какой ты хлебушек»: вопросы, баллы и результаты.
+Все данные и клавиатуры собираются один раз при импорте модуля.
+"""
+
+from bisect import bisect_right
+from typing import Dict, List, NamedTuple, Optional
+
+from telegram import KeyboardButton, ReplyKeyboardMarkup, ReplyKeyboardRemove, Update
+from telegram.ext import (
+    CommandHandler,
+    ConversationHandler,
+    ContextTypes,
+    MessageHandler,
+    TypeHandler,
+    filters,
+)
+
+from media_registry import media_registry
+
+# состояние диалога теста
+ANSWERING = 0
+
+# через сколько секунд бездействия тест сбрасывается
+TEST_TIMEOUT = 15 * 60
+
+# список вопросов и вариантов ответа, баллы за каждый вариант идут в том же порядке
+QUESTIONS = [
+    {
+        "question": "1. Твоё любимое время года?",
+        "options": ["зима", "лето", "осень", "весна"],
+        "points": [4, 2, 1, 3]  # баллы за каждый вариант
+    },
+    {
+        "question": "2. Выбери, что больше всего тебя описывает?",
+        "options": ["экстраверт (общительный)", "интроверт (стеснительный)",
+                    "амбиверт (среднее между первым и вторым)", "омниверт (зависит от настроения)"],
+        "points": [1, 4, 2, 3]
+    },
+    {
+        "question": "3. Какой у тебя тип темперамента?",
+        "options": ["сангвиник (экстраверты, активные)",
+                    "холерик (экстраверты, лидеры, холодные)",
+                    "меланхолик (интроверты, ранимые)",
+                    "флегматик (интроверты, терпеливые, надёжные)"],
+        "points": [1, 2, 4, 3]
+    },
+    {
+        "question": "4. Какие шутки вам нравятся?",
+        "options": ["про колобка/русалку", "про евреев",
+                    "про маты", "жестокие"],
+        "points": [1, 4, 3, 2]
+    },
+    {
+        "question": "5. Какой вид науки наиболее близок вам?",
+        "options": ["естественные", "технические",
+                    "социальные", "гуманитарные"],
+        "points": [3, 4, 2, 1]
+    },
+    {
+        "question": "6. Какие цвета вас больше всего привлекают?",
+        "options": ["холодные", "тёплые", "нейтральные (чб)", "всё и сразу"],
+        "points": [4, 3, 2, 1]
+    },
+    {
+        "question": "7. Какой фильм из предложенных вам нраится больше всего?",
+        "options": ["1+1", "Хатико", "Шерлок Холмс", "Голодные игры"],
+        "points": [4, 1, 2, 3]
+    },
+    {
+        "question": "8. Какой жанр музыки вам больше всего нравится?",
+        "options": ["поп", "рок", "хип-хоп", "классическая"],
+        "points": [2, 4, 1, 3]
+    },
+    {
+        "question": "9. Какое ваше любимое времяпровождение?",
+        "options": ["чтение книг", "просмотр сериалов",
+                    "спорт и активные игры", "прогулки"],
+        "points": [1, 4, 2, 3]
+    },
+    {
+        "question": "10. Какой ваш любимый напиток?",
+        "options": ["газировка", "кофе", "чай", "сок"],
+        "points": [4, 1, 2, 3]
+    },
+    {
+        "question": "11. Что вы предпочитаете?",
+        "options": ["путешествия", "просмотр фильма",
+                    "вечеринки", "занятия творчеством"],
+        "points": [3, 4, 1, 2]
+    },
+    {
+        "question": "12. Какое качество вы цените в себе больше всего?",
+        "options": ["надёжность", "креативность", "общительность", "спокойствие"],
+        "points": [4, 2, 1, 3]
+    },
+    {
+        "question": "13. Как вы реагируете на неожиданные изменения в планах?",
+        "options": ["спокойно адаптируюсь",
+                    "немного расстраиваюсь",
+                    "сильно переживаю",
+                    "радуюсь новым возможностям"],
+        "points": [3, 4, 2, 1]
+    },
+    {
+        "question": "14. Какой напиток вы выберете к завтраку?",
+        "options": ["кофе", "чай", "сок", "вода"],
+        "points": [1, 3, 2, 4]
+    },
+    {
+        "question": "15. Как вы относитесь к новым знакомствам?",
+        "options": ["легко и с энтузиазмом", "с осторожностью",
+                    "предпочитаю проверенных друзей", "зависит от настроения"],
+        "points": [1, 3, 4, 2]
+    },
+    {
+        "question": "16. Какой стиль одежды вам ближе?",
+        "options": ["классический", "спортивный", "кэжуал", "экстравагантный"],
+        "points": [3, 2, 4, 1]
+    },
+    {
+        "question": "17. Как вы справляетесь с конфликтными ситуациями?",
+        "options": ["компромисс", "борьба до конца", "избегание", "когда как"],
+        "points": [2, 3, 1, 4]
+    },
+    {
+        "question": "18. Какую кухню вы предпочитаете?",
+        "options": ["итальянскую", "азиатскую", "домашнюю", "экзотическую"],
+        "points": [4, 2, 3, 1]
+    },
+    {
+        "question": "19. Как вы относитесь к работе в команде?",
+        "options": ["нравится", "нет, я за самостоятельность",
+                    "могу и так и так", "когда как"],
+        "points": [2, 4, 3, 1]
+    },
+    {
+        "question": "20. Какой жанр фильмов вам нравится больше всего?",
+        "options": ["комедия", "драма", "фантастика", "документальный"],
+        "points": [4, 1, 3, 2]
+    },
+    {
+        "question": "21. С чем лучше всего есть хлеб?",
+        "options": ["ни с чем", "с сыром и вином",
+                    "со святой водой", "с голодными собаками"],
+        "points": [4, 3, 2, 1]
+    },
+    {
+        "question": "22. Сколько хлеб можно хранить?",
+        "options": ["день", "неделю", "испорченный лучше", "вечность"],
+        "points": [3, 4, 1, 2]
+    },
+    {
+        "question": "23. Какой ты хлеб в культуре?",
+        "options": ["«Булочник» Кустодиева",
+                    "«Баллада о хлебе» Кузнецова",
+                    "«Евангелие от Иоанна, глава 6",
+                    "«Советские хлебы» Ильи Машковой"],
+        "points": [4, 2, 3, 1]
+    },
+    {
+        "question": "24. Что вы думаете о еде на ночь?",
+        "options": ["да, конечно!", "нет, потолстею", "немного", "религия не позволяет"],
+        "points": [4, 1, 3, 2]
+    },
+    {
+        "question": "25. Кто ты на пикнике с шашлыком?",
+        "options": ["лаваш", "лепёшка",
+                    "корочка", "уксус"],
+        "points": [4, 3, 2, 1]
+    },
+    {
+        "question": "26. Какой у тебя любимый бутерброд?",
+        "options": ["с майонезом и кетчупом", "с колбасой", "горячий", "тост"],
+        "points": [2, 4, 3, 1]
+    },
+    {
+        "question": "27. Какой у тебя любимый соус?",
+        "options": ["сырный", "кисло-сладкий", "кетчунез", "тереяки"],
+        "points": [4, 3, 2, 1]
+    },
+    {
+        "question": "28. Что без хлеба не едят?",
+        "options": ["борщ", "стейк", "ничего", "всё"],
+        "points": [3, 2, 1, 4]
+    },
+    {
+        "question": "29. Какие у тебя любимые печенки в виде животных?",
+        "options": ["зоологические", "фигурные песочные",
+                    "печенье «Забавные зверушки»", "печенье «Зоопарк»"],
+        "points": [2, 1, 4, 3]
+    },
+    {
+        "question": "30. Какая самая легендарная сладость?",
+        "options": ["тульский пряник", "калужское тесто",
+                    "пасхальный кулич", "чесночный хлеб"],
+        "points": [3, 1, 2, 4]
+    }
+]
+
+class ResultBand(NamedTuple):
+    # нижняя граница баллов (включительно), текст результата и аудио к нему
+    lower: int
+    text: str
+    audio: str
+
+
+# результаты по возрастанию нижней границы; верхняя граница - следующая полоса
+RESULT_BANDS = [
+    ResultBand(30, 'Вы - смак. Вы душа компании и очень общительный',
+               "МузыкаПроектЯ2025/Шампунь Жумайсынба_Смак.mp3"),
+    ResultBand(37, 'Вы - бабушкин пирожок. Ассоциация с чем-то домашним,'
+                   ' тёплым, ностальгическим.',
+               "МузыкаПроектЯ2025/Ромашки_спрятались_Бабушкин_пирожок.mp3"),
+    ResultBand(43, 'Вы - булочка с корицей. Думаю, вы жизнерадостный и позитивный',
+               "МузыкаПроектЯ2025/Световая_Булочка с корицей.mp3"),
+    ResultBand(49, 'Вы - булочка с маком. Вы очень милый, добрый и общительный человек)',
+               "МузыкаПроектЯ2025/Младший_лейтенант_Булочка_с_маком.mp3"),
+    ResultBand(55, 'Вы - буханка. Чёрный хлеб это хорошо)',
+               "МузыкаПроектЯ2025/Гимн Авторадио_Буханка.mp3"),
+    ResultBand(61, 'Вы - батон. Вы самый обычный человек, это не плохо и не хорошо',
+               "МузыкаПроектЯ2025/Цвет настроения синий_Батон.mp3"),
+    ResultBand(67, 'Вы - чуду(лепёшка с начинкой). Думаю, вы очень весёлый)',
+               "МузыкаПроектЯ2025/Дагестан_Чуду.mp3"),
+    ResultBand(73, 'Вы - ватрушка с творогом. Думаю, вы добрый человек, '
+                   'очень интересный в общении',
+               "МузыкаПроектЯ2025/Пиво_с_раками_Ватрушка_с_творогом.mp3"),
+    ResultBand(79, 'Вы - багет. Вы позитивный и добрый человек, возможно, общительный',
+               "МузыкаПроектЯ2025/Я в Париже_Багет.mp3"),
+    ResultBand(85, 'Вы - чиабатта. Вы хороший, доброжелательный человек',
+               "МузыкаПроектЯ2025/Ча_ча_ча_чиабатта.mp3"),
+    ResultBand(91, 'Вы - эчпочмак. Вы весёлый человек, возможно, душа компании',
+               "МузыкаПроектЯ2025/Эчпочмак_Эчпочмак.mp3"),
+    ResultBand(97, 'Вы - блины. Ассоциация с вами- уют, тепло и комфорт)',
+               "МузыкаПроектЯ2025/Гори гори ясно_Блины.mp3"),
+    ResultBand(103, 'Вы - просфора(богослужебный хлеб). Вы очень милый человек)',
+               "МузыкаПроектЯ2025/Хор «Отче Наш»_Просфора.mp3"),
+    ResultBand(109, "Вы - хлеб из майнкрафта. Думаю, вы очень хороший, добрый человек, "
+                    "вы как и хлеб из майнкрафта - легенда)",
+               "МузыкаПроектЯ2025/Музыка_из_Майнкрафта_Майнкрафт_хлеб.mp3"),
+    ResultBand(115, "Вы - шаурма. Вы кайфовый человек, но скорее всего "
+                    "стеснительный и не очень общительный",
+               "МузыкаПроектЯ2025/Хлопки_Шаурма.mp3"),
+]
+MAX_SCORE = 120
+
+# всё, что нужно на каждый ответ, считается заранее
+ANSWER_POINTS: List[Dict[str, int]] = [
+    dict(zip(question["options"], question["points"])) for question in QUESTIONS
+]
+KEYBOARDS: List[ReplyKeyboardMarkup] = [
+    ReplyKeyboardMarkup(
+        [
+            [KeyboardButton(option) for option in question["options"][:2]],  # первая строка
+            [KeyboardButton(option) for option in question["options"][2:]]  # вторая строка
+        ],
+        one_time_keyboard=True,
+        resize_keyboard=True
+    )
+    for question in QUESTIONS
+]
+BAND_BOUNDS = [band.lower for band in RESULT_BANDS]
+BREAD_TEST_AUDIO = [band.audio for band in RESULT_BANDS]
+
+
+def answer_points(index: int, answer: str) -> Optional[int]:
+    # баллы за ответ на вопрос index или None, если такого варианта нет
+    return ANSWER_POINTS[index].get(answer)
+
+
+def resolve_result(score: int) -> Optional[ResultBand]:
+    # поиск полосы результата бинарным поиском по нижним границам
+    if score > MAX_SCORE:
+        return None
+    position = bisect_right(BAND_BOUNDS, score) - 1
+    return RESULT_BANDS[position] if position >= 0 else None
+
+
+# отправка аудио по file_id, файл выгружается только в первый раз
+async def send_bread_audio(update: Update, context: ContextTypes.DEFAULT_TYPE, path: str) -> None:
+    try:
+        await media_registry.send_audio(context.bot, update.effective_chat.id, path,
+                                        caption="Вот аудио для тебя")
+    except FileNotFoundError:
+        await update.message.reply_text('Извините, аудиофайл не найден.')
+
+
+async def send_question(update: Update, index: int) -> None:
+    await update.message.reply_text(QUESTIONS[index]["question"], reply_markup=KEYBOARDS[index])
+
+
+async def start_test(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    # каждый запуск теста начинается с чистого листа
+    context.user_data['bread_index'] = 0
+    context.user_data['res_score'] = 0
+    await send_question(update, 0)
+    return ANSWERING
+
+
+async def handle_answer(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    index = context.user_data.get('bread_index', 0)
+    points = answer_points(index, update.message.text)
+    if points is None:
+        await update.message.reply_text("Пожалуйста, выберите один из предложенных вариантов.")
+        return ANSWERING
+
+    # обновляем баллы и переходим к следующему вопросу
+    context.user_data['res_score'] += points
+    index += 1
+    context.user_data['bread_index'] = index
+    if index < len(QUESTIONS):
+        await send_question(update, index)
+        return ANSWERING
+
+    # подсчет баллов
+    res_score = context.user_data.pop('res_score')
+    context.user_data.pop('bread_index', None)
+    await update.message.reply_text(f"Тест завершен! Ваши баллы: {res_score}",
+                                    reply_markup=ReplyKeyboardRemove())
+    result = resolve_result(res_score)
+    if result:
+        await update.message.reply_text(result.text)
+        await send_bread_audio(update, context, result.audio)
+    else:
+        await update.message.reply_text("Спасибо за участие!")
+    return ConversationHandler.END
+
+
+async def cancel_test(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    context.user_data.pop('bread_index', None)
+    context.user_data.pop('res_score', None)
+    await update.message.reply_text("Тест отменён.", reply_markup=ReplyKeyboardRemove())
+    return ConversationHandler.END
+
+
+async def test_timeout(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    context.user_data.pop('bread_index', None)
+    context.user_data.pop('res_score', None)
+    if update.effective_message:
+        await update.effective_message.reply_text("Время на тест вышло, начните заново: /bread_test",
+                                                  reply_markup=ReplyKeyboardRemove())
+
+
+# диалог теста регистрируется один раз, состояние хранится отдельно для каждого пользователя
+bread_test_conversation = ConversationHandler(
+    entry_points=[CommandHandler('bread_test', start_test)],
+    states={
+        ANSWERING: [MessageHandler(filters.TEXT & ~filters.COMMAND, handle_answer)],
+        ConversationHandler.TIMEOUT: [TypeHandler(Update, test_timeout)],
+    },
+    fallbacks=[CommandHandler('cancel', cancel_test), CommandHandler('bread_test', start_test)],
+    conversation_timeout=TEST_TIMEOUT,
+)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+In-memory caching helpers for the Telegram Travel Bot.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries optionally expire.
+
+    The least recently used entry is evicted once ``maxsize`` is reached.
+    Entries older than ``ttl`` seconds are treated as missing.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove key from the cache and return its value."""
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and current size."""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._data)}
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and (entry[1] is None or entry[1] > time.monotonic())
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one execution.
+
+    While a call for a key is running, later callers with the same key
+    wait for it and get the same result (or exception) instead of
+    starting their own.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        # Running calls; also keeps a reference so they aren't GC'd
+        self._running: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """
+        Run ``await fn(*args)`` unless a call for key is already running.
+
+        Args:
+            key: Identifies equivalent calls
+            fn: Coroutine function to run
+            *args: Arguments for fn
+
+        Returns:
+            The result of the (shared) call
+        """
+        task = self._running.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.create_task(fn(*args))
+            self._running[key] = task
+            task.add_done_callback(lambda t: self._on_done(key, t))
+        else:
+            self.coalesced += 1
+        # Shield the shared call so one cancelled waiter doesn't cancel it for all
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._running.get(key) is task:
+            del self._running[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Return call counters and the number of calls in flight."""
+        return {'calls': self.calls, 'coalesced': self.coalesced, 'in_flight': len(self._running)}
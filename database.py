@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Database gateway for the Telegram Travel Bot.
+Owns a small pool of long-lived SQLite connections and runs every query
+in a dedicated thread pool, so handlers never block the event loop.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional, Sequence
+
+# === Logging ===
+logger = logging.getLogger(__name__)
+
+# === Constants ===
+DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'finalproject.db')
+
+# Number of worker threads, each holding one connection
+POOL_SIZE = 4
+
+# Applied to every new connection
+PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA busy_timeout=5000',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-8000',
+)
+
+
+class Database:
+    """
+    Pool of SQLite connections bound to worker threads.
+
+    Every call runs ``fn(conn, *args)`` on one of the pool threads inside a
+    transaction: it is committed when ``fn`` returns and rolled back if
+    it raises.
+    """
+
+    def __init__(self, path: str = DB_PATH, pool_size: int = POOL_SIZE):
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='db')
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get the connection of the current worker thread, opening it once."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Each connection is only used by its own thread; close() runs elsewhere
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            for pragma in PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _call(self, fn: Callable[..., Any], args: Sequence[Any]) -> Any:
+        conn = self._connection()
+        with conn:
+            return fn(conn, *args)
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run fn(conn, *args) on a pool thread.
+
+        Args:
+            fn: Callable receiving a sqlite3.Connection as first argument
+            *args: Extra arguments for fn
+
+        Returns:
+            Whatever fn returns
+
+        Raises:
+            sqlite3.Error: if the query fails
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._call, fn, args)
+
+    def run_sync(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Blocking version of run() for startup code outside the event loop."""
+        return self._executor.submit(self._call, fn, args).result()
+
+    async def execute(self, sql: str, params: Sequence[Any] = ()) -> int:
+        """Execute one statement and return the number of affected rows."""
+        return await self.run(lambda conn: conn.execute(sql, params).rowcount)
+
+    async def executemany(self, sql: str, seq_of_params: Iterable[Sequence[Any]]) -> int:
+        """Execute a statement for every parameter set in one transaction."""
+        return await self.run(lambda conn: conn.executemany(sql, seq_of_params).rowcount)
+
+    async def fetchone(self, sql: str, params: Sequence[Any] = ()) -> Optional[tuple]:
+        """Run a query and return its first row, or None."""
+        return await self.run(lambda conn: conn.execute(sql, params).fetchone())
+
+    async def fetchall(self, sql: str, params: Sequence[Any] = ()) -> List[tuple]:
+        """Run a query and return all rows."""
+        return await self.run(lambda conn: conn.execute(sql, params).fetchall())
+
+    def close(self) -> None:
+        """Wait for running queries and close every pooled connection."""
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        logger.info("Database connections closed")
+
+
+# Shared gateway used by every module
+db = Database()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Dish cache for the Telegram Travel Bot.
+Keeps the dishes found for each country in an in-memory LRU in front of a
+persistent SQLite table, so /food only scrapes a country once per TTL.
+Countries without results are cached too, for a shorter time.
+"""
+
+import json
+import logging
+import sqlite3
+import time
+from typing import Dict, List, Optional
+
+from caching import TTLCache
+from database import db
+
+# === Logging ===
+logger = logging.getLogger(__name__)
+
+# === Constants ===
+# Defaults, overridable through the [cache] section of config.ini
+DEFAULT_TTL = 30 * 24 * 60 * 60  # 30 days
+DEFAULT_NEGATIVE_TTL = 24 * 60 * 60  # 1 day
+DEFAULT_MAXSIZE = 512
+
+
+def normalize_country(country_name: str) -> str:
+    """Normalize a country name so 'france ' and 'France' share one entry."""
+    return ' '.join(country_name.casefold().split())
+
+
+class DishCache:
+    """Two-level (memory + SQLite) cache of country name -> list of dishes."""
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, ttl: float = DEFAULT_TTL,
+                 negative_ttl: float = DEFAULT_NEGATIVE_TTL):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.memory = TTLCache(maxsize=maxsize)
+        self.disk_hits = 0
+        self.misses = 0
+        self._setup_table()
+
+    def _setup_table(self) -> None:
+        """Create the dish cache table if it doesn't exist."""
+        try:
+            db.run_sync(lambda conn: conn.execute('''
+                CREATE TABLE IF NOT EXISTS dish_cache (
+                    country TEXT PRIMARY KEY,
+                    dishes TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            '''))
+        except sqlite3.Error as e:
+            logger.error(f"Database error setting up dish cache: {e}")
+
+    async def get(self, country_name: str) -> Optional[List[str]]:
+        """
+        Look up cached dishes.
+
+        Args:
+            country_name: Country as typed by the user
+
+        Returns:
+            List of dishes (empty for a country known to have none),
+            or None on a miss
+        """
+        key = normalize_country(country_name)
+        dishes = self.memory.get(key)
+        if dishes is not None:
+            return dishes
+
+        try:
+            row = await db.fetchone(
+                'SELECT dishes, expires_at FROM dish_cache WHERE country = ?',
+                (key,)
+            )
+        except sqlite3.Error as e:
+            logger.error(f"Database error reading dish cache: {e}")
+            row = None
+
+        if row is None or row[1] <= time.time():
+            self.misses += 1
+            return None
+
+        dishes = json.loads(row[0])
+        # Only keep the entry in memory for the rest of its on-disk lifetime
+        self.memory.set(key, dishes, ttl=row[1] - time.time())
+        self.disk_hits += 1
+        return dishes
+
+    async def set(self, country_name: str, dishes: List[str]) -> None:
+        """Store dishes in memory and on disk; an empty list is a negative entry."""
+        key = normalize_country(country_name)
+        ttl = self.ttl if dishes else self.negative_ttl
+        self.memory.set(key, dishes, ttl=ttl)
+        try:
+            await db.execute(
+                '''INSERT INTO dish_cache (country, dishes, expires_at)
+                   VALUES (?, ?, ?)
+                   ON CONFLICT(country)
+                   DO UPDATE SET dishes = excluded.dishes,
+                                 expires_at = excluded.expires_at''',
+                (key, json.dumps(dishes, ensure_ascii=False), time.time() + ttl)
+            )
+        except sqlite3.Error as e:
+            logger.error(f"Database error writing dish cache: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters for both cache levels."""
+        return {
+            'memory_hits': self.memory.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'size': len(self.memory),
+        }
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Offline dish index for the Telegram Travel Bot.
+Built once from saved Wikipedia "Cuisine_of_*" pages into a small SQLite
+file and loaded into memory at startup, so /food answers known countries
+without touching the network.
+
+Build or refresh the index:
+
+    python dish_index.py saved_pages/
+"""
+
+import logging
+import os
+import sqlite3
+from typing import Dict, List, Optional
+from urllib.parse import unquote
+
+from dish_cache import normalize_country
+from food_parsing import parse_dishes_sections
+
+# === Logging ===
+logger = logging.getLogger(__name__)
+
+# === Constants ===
+INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dish_index.db')
+PAGE_PREFIX = 'Cuisine_of_'
+MAX_DISHES = 5
+
+
+def index_key(country_name: str) -> str:
+    """Index key for a country; 'the United States' and 'United States' match."""
+    key = normalize_country(country_name)
+    return key[4:] if key.startswith('the ') else key
+
+
+def country_from_filename(filename: str) -> Optional[str]:
+    """'Cuisine_of_South_Korea.html' -> 'South Korea', None for other files."""
+    stem, ext = os.path.splitext(filename)
+    if ext.lower() not in ('.html', '.htm') or not stem.startswith(PAGE_PREFIX):
+        return None
+    return unquote(stem[len(PAGE_PREFIX):]).replace('_', ' ')
+
+
+def build_index(pages_dir: str, index_path: str = INDEX_PATH) -> Dict[str, int]:
+    """
+    Parse every saved cuisine page and write the dish index.
+
+    Args:
+        pages_dir: Directory with saved Cuisine_of_*.html pages
+        index_path: SQLite file to (re)write
+
+    Returns:
+        Counters: 'countries' indexed, 'dishes' written, 'empty' pages skipped
+    """
+    rows = []
+    counts = {'countries': 0, 'dishes': 0, 'empty': 0}
+    for filename in sorted(os.listdir(pages_dir)):
+        country = country_from_filename(filename)
+        if country is None:
+            continue
+        with open(os.path.join(pages_dir, filename), 'r', encoding='utf-8') as f:
+            dishes = parse_dishes_sections(f.read(), max_items=MAX_DISHES)
+        if not dishes:
+            counts['empty'] += 1
+            continue
+        key = index_key(country)
+        rows.extend((key, position, dish) for position, dish in enumerate(dishes))
+        counts['countries'] += 1
+        counts['dishes'] += len(dishes)
+
+    conn = sqlite3.connect(index_path)
+    try:
+        with conn:
+            conn.execute('DROP TABLE IF EXISTS dishes')
+            conn.execute('''
+                CREATE TABLE dishes (
+                    country TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    dish TEXT NOT NULL,
+                    PRIMARY KEY (country, position)
+                ) WITHOUT ROWID
+            ''')
+            conn.executemany('INSERT OR REPLACE INTO dishes VALUES (?, ?, ?)', rows)
+        conn.execute('VACUUM')
+    finally:
+        conn.close()
+    return counts
+
+
+class DishIndex:
+    """Read-only in-memory view of the offline dish index."""
+
+    def __init__(self, index_path: str = INDEX_PATH):
+        self.index_path = index_path
+        self.dishes: Dict[str, List[str]] = {}
+        self.load()
+
+    def load(self) -> None:
+        """(Re)load the index file; a missing file just leaves the index empty."""
+        self.dishes = {}
+        if not os.path.isfile(self.index_path):
+            logger.info("No offline dish index, /food will use the network only")
+            return
+        try:
+            conn = sqlite3.connect(f"file:{self.index_path}?mode=ro", uri=True)
+            try:
+                rows = conn.execute(
+                    'SELECT country, dish FROM dishes ORDER BY country, position'
+                ).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.error(f"Database error loading dish index: {e}")
+            return
+        for country, dish in rows:
+            self.dishes.setdefault(country, []).append(dish)
+        logger.info(f"Loaded offline dishes for {len(self.dishes)} countries")
+
+    def get(self, country_name: str) -> Optional[List[str]]:
+        """Dishes for a country, or None if it isn't in the index."""
+        return self.dishes.get(index_key(country_name))
+
+
+dish_index = DishIndex()
+
+
+if __name__ == '__main__':
+    import sys
+
+    if len(sys.argv) != 2:
+        print("Использование: python dish_index.py <папка с Cuisine_of_*.html>")
+        sys.exit(1)
+    result = build_index(sys.argv[1])
+    print(f"Стран: {result['countries']}, блюд: {result['dishes']}, пустых страниц: {result['empty']}")
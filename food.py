@@ -1,8 +1,40 @@
-import requests
-from bs4 import BeautifulSoup
-import re
-from urllib.parse import quote
+import asyncio
+import configparser
+import logging
+import os
 import random
+from urllib.parse import quote
+
+import pycountry
+from dish_cache import DishCache
+from dish_index import dish_index
+from food_parsing import parse_dishes_sections, parse_general_dishes, parse_search_links
+from http_client import HTTP_ERRORS, get_text
+from resilience import domain_guards, is_upstream_failure
+
+logger = logging.getLogger(__name__)
+
+config = configparser.ConfigParser()
+config.read(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.ini'))
+
+# найденные блюда хранятся в базе, чтобы не качать википедию на каждый /food
+dish_cache = DishCache(
+    maxsize=config.getint('cache', 'dish_size', fallback=512),
+    ttl=config.getint('cache', 'dish_ttl', fallback=30 * 24 * 60 * 60),
+    negative_ttl=config.getint('cache', 'dish_negative_ttl', fallback=24 * 60 * 60),
+)
+
+# пауза между странами при фоновом прогреве кэша, в секундах
+PREWARM_INTERVAL = config.getfloat('cache', 'dish_prewarm_interval', fallback=30)
+
+# общий лимит времени на весь поиск блюд для одной страны, в секундах
+FOOD_DEADLINE = 15
+
+# таймаут одного запроса к странице
+FETCH_TIMEOUT = 8
+
+GOOGLE_SEARCH_URL = "https://www.google.com/search"
+DISH_PAGE_URL = "https://en.wikipedia.org/wiki/Dish"
 
 # основной запрос
 HEADERS = {
@@ -35,163 +67,194 @@ def get_country_cuisine_url(country_name):
     return base_url + country_formatted
 
 
-def fetch_page(url):
-    # продолжается делаться запросик
-    try:
-        response = requests.get(url, headers=HEADERS, timeout=10)
-        response.raise_for_status()
-        return response.text
-    except requests.RequestException as e:
-        print(f"Error fetching page {url}: {e}")
+async def fetch_page(url):
+    # продолжается делаться запросик, не блокируя остальных пользователей;
+    # если сайт сейчас лежит или мы упёрлись в лимит, сразу сдаёмся.
+    # None - страницу получить не удалось (сбой, таймаут, пропуск),
+    # "" - сайт ответил, но страницы нет или её не прочитать (например 404)
+    if not await domain_guards.acquire(url):
         return None
+    try:
+        html = await get_text(url, headers=HEADERS, timeout=FETCH_TIMEOUT)
+    except HTTP_ERRORS as e:
+        logger.warning(f"Error fetching page {url}: {e}")
+        if is_upstream_failure(e):
+            domain_guards.record_failure(url)
+            return None
+        domain_guards.record_success(url)
+        return ""
+    except UnicodeDecodeError as e:
+        # сайт ответил, просто страница в странной кодировке
+        logger.warning(f"Error decoding page {url}: {e}")
+        domain_guards.record_success(url)
+        return ""
+    domain_guards.record_success(url)
+    return html
 
 
-def parse_dishes_sections(html, max_items=5):
-    # фильтрация хтмл и нахождение из хтмл блюда и тому пдобное
-    soup = BeautifulSoup(html, 'html.parser')
-    content = soup.find(id='mw-content-text')
-    if not content:
+# какой разборщик использовать для каждого источника страниц
+EXTRACTORS = {
+    'wikipedia': parse_dishes_sections,
+    'general': parse_general_dishes,
+    'search': parse_search_links,
+}
+
+
+async def google_search_urls(query, max_results=5):
+    # делается запрос в гугл и смотрятся разные вещи
+    search_url = f"{GOOGLE_SEARCH_URL}?q={quote(query)}&hl=en"
+    html = await fetch_page(search_url)
+    if html is None:
+        return None
+    if not html:
         return []
+    return await asyncio.to_thread(EXTRACTORS['search'], html, max_results)
 
-    items = []
-    relevant_sections = [
-        "dish",
-        "food",
-        "cuisine",
-        "meal",
-        "recipe",
-        "specialty",
-        "appetizer",
-        "dessert",
-        "snack"
-    ]
 
-    for header in content.find_all(['h2', 'h3', 'h4']):
-        heading_text = header.get_text(separator=" ", strip=True)
-        heading_text_clean = re.sub(r'\[edit\]', '', heading_text, flags=re.I).lower()
+async def _cancel(tasks):
+    # отменяем то, что уже не нужно, и дожидаемся, чтобы не было висящих задач
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
 
-        if any(keyword in heading_text_clean for keyword in relevant_sections):
-            for sibling in header.find_next_siblings():
-                if sibling.name and sibling.name.startswith('h') and len(sibling.name) <= len(header.name):
-                    break
-                if sibling.name == 'ul':
-                    for li in sibling.find_all('li', recursive=False):
-                        text = li.get_text(separator=' ', strip=True)
-                        text = re.sub(r'\[\d+\]', '', text)
-                        word_count = len(text.split())
-                        if 1 <= word_count <= 7:
-                            items.append(text)
-                if len(items) >= max_items * 2:
-                    break
-            if len(items) >= max_items * 2:
-                break
 
-    unique_items = []
-    for item in items:
-        if item not in unique_items:
-            unique_items.append(item)
-        if len(unique_items) >= max_items:
-            break
-    return unique_items
-
-
-def parse_general_dishes(html, max_items=5):
-    # ассматривается хтмл запрос и ищутся нужные вещи
-    soup = BeautifulSoup(html, 'html.parser')
-    items = []
-
-    for ul in soup.find_all('ul'):
-        for li in ul.find_all('li', recursive=False):
-            text = li.get_text(separator=' ', strip=True)
-            text = re.sub(r'\[\d+\]', '', text)
-            word_count = len(text.split())
-            if 1 <= word_count <= 7:
-                items.append(text)
-        if len(items) >= max_items * 3:
-            break
-
-    unique_items = []
-    for item in items:
-        if item not in unique_items:
-            unique_items.append(item)
-        if len(unique_items) >= max_items:
-            break
-    return unique_items
-
-
-def google_search_urls(query, max_results=5):
-    # делается запрос в гугл и смотрятся разные вещи
-    search_url = f"https://www.google.com/search?q={quote(query)}&hl=en"
-    try:
-        resp = requests.get(search_url, headers=HEADERS, timeout=10)
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, 'html.parser')
-
-        links = []
-        for a in soup.find_all('a', href=True):
-            href = a['href']
-            if href.startswith("/url?q="):
-                url = href.split("/url?q=")[1].split("&")[0]
-                if url and (url not in links):
-                    links.append(url)
-                if len(links) >= max_results:
-                    break
-        return links
-    except requests.RequestException as e:
+async def _parse_page(url, source, max_items):
+    # парсинг большого хтмл идёт в отдельном потоке, чтобы не тормозить бота;
+    # None значит, что страницу получить не удалось
+    html = await fetch_page(url)
+    if html is None:
+        return None
+    if not html:
         return []
+    return await asyncio.to_thread(EXTRACTORS[source], html, max_items)
 
 
-def get_dishes_from_search_queries(country_name, max_dishes=5):
-    dishes = []
+async def get_dishes_from_search_queries(country_name, max_dishes=5):
     queries = [f"food {country_name}", f"{country_name} food"]
 
-    for query in queries:
-        urls = google_search_urls(query, max_results=3)
-        for url in urls:
-            html = fetch_page(url)
-            if not html:
+    # оба поисковых запроса идут одновременно
+    results = await asyncio.gather(*(google_search_urls(query, max_results=3) for query in queries))
+    # если что-то не ответило, пустой итог не значит, что блюд нет
+    failed = any(urls is None for urls in results)
+    urls = list(dict.fromkeys(url for urls in results if urls for url in urls))
+    # сайты с открытым предохранителем даже не пробуем
+    available = [url for url in urls if domain_guards.available(url)]
+    failed = failed or len(available) < len(urls)
+
+    # все найденные страницы качаются параллельно, собираем блюда по мере готовности
+    dishes = []
+    tasks = [asyncio.create_task(_parse_page(url, 'general', max_dishes)) for url in available]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            found = await next_done
+            if found is None:
+                failed = True
                 continue
-            found_items = parse_general_dishes(html, max_items=max_dishes)
-            for item in found_items:
+            for item in found:
                 if item not in dishes:
                     dishes.append(item)
                     if len(dishes) >= max_dishes:
                         return dishes
-    return dishes
+    finally:
+        await _cancel(tasks)
+    # None: ничего не нашли, но не все источники ответили
+    return None if failed and not dishes else dishes
 
 
 def fallback_no_dishes_message(country):
     dish = random.choice(FALLBACK_DISHES)
-    print(f"Из {country} нет ничего интересного, лучше поешь {dish}")
-
-
-def get_dishes_by_country(country_name):
-    # Попытка 1: поиск еды из страны
-    url = get_country_cuisine_url(country_name)
-    html = fetch_page(url)
-    if html:
-        dishes = parse_dishes_sections(html, max_items=5)
-        if dishes:
-            return dishes
-    # Попытка 2: если ничего не найдено, то пробовать найти еду из викепедии
-    fallback_url = "https://en.wikipedia.org/wiki/Dish"
-    fallback_html = fetch_page(fallback_url)
-    if fallback_html:
-        fallback_dishes = parse_dishes_sections(fallback_html, max_items=10)
-        if fallback_dishes:
-            return fallback_dishes
-    # Попытка 3: если ничего не найдено в предыдущих запросах, поиск в поисковых системах
-    search_dishes = get_dishes_from_search_queries(country_name, max_dishes=5)
-    if search_dishes:
-        return search_dishes
+    logger.info(f"Из {country} нет ничего интересного, лучше поешь {dish}")
+
+
+def _task_dishes(task):
+    # результат завершённой задачи; None - источник упал или не ответил
+    if task.cancelled():
+        return None
+    if task.exception() is not None:
+        logger.warning(f"Dish source failed: {task.exception()!r}")
+        return None
+    return task.result()
+
+
+async def get_dishes_by_country(country_name, deadline=FOOD_DEADLINE):
+    # возвращает (блюда, complete); complete - все источники честно ответили,
+    # ни один не упал, не был пропущен и не упёрся в общий лимит времени.
+    # все источники запускаются сразу, в списке они идут по приоритету:
+    # 1: страница кухни страны в википедии
+    # 2: общая статья Dish из википедии
+    # 3: поиск в поисковых системах
+    # источники, чей сайт сейчас отключён предохранителем, пропускаются
+    cuisine_url = get_country_cuisine_url(country_name)
+    sources = [
+        (cuisine_url, lambda: _parse_page(cuisine_url, 'wikipedia', 5)),
+        (DISH_PAGE_URL, lambda: _parse_page(DISH_PAGE_URL, 'wikipedia', 10)),
+        (GOOGLE_SEARCH_URL, lambda: get_dishes_from_search_queries(country_name, max_dishes=5)),
+    ]
+    tasks = [asyncio.create_task(start()) for url, start in sources if domain_guards.available(url)]
+    complete = len(tasks) == len(sources)
+    loop = asyncio.get_running_loop()
+    stop_at = loop.time() + deadline
+    try:
+        while True:
+            # берём самый приоритетный источник, если все источники выше него уже ответили пустотой
+            for task in tasks:
+                if not task.done():
+                    break
+                if _task_dishes(task):
+                    return task.result(), True
+            else:
+                break
+
+            pending = [task for task in tasks if not task.done()]
+            remaining = stop_at - loop.time()
+            if remaining <= 0:
+                # время вышло: отдаём лучшее из того, что уже успело прийти
+                logger.warning(f"Dish lookup for {country_name} hit the {deadline}s deadline")
+                complete = False
+                for task in tasks:
+                    if task.done() and _task_dishes(task):
+                        return task.result(), True
+                break
+            await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        await _cancel(tasks)
+
+    complete = complete and all(_task_dishes(task) is not None for task in tasks)
     # Финальная попытка: если каким-то чудом из всех предыдущих запросов ничего не найдено, то делается это
     fallback_no_dishes_message(country_name)
-    return []
+    return [], complete
+
+
+async def get_cached_dishes(country_name):
+    # сначала офлайн-индекс и кэш, в сеть идём только если страны там нет
+    dishes = dish_index.get(country_name)
+    if dishes is not None:
+        return dishes
+    dishes = await dish_cache.get(country_name)
+    if dishes is None:
+        dishes, complete = await get_dishes_by_country(country_name)
+        # "блюд нет" запоминаем, только если все источники действительно ответили;
+        # сбой, таймаут или пропущенный источник ничего не говорят о стране
+        if dishes or complete:
+            await dish_cache.set(country_name, dishes)
+    return dishes
+
+
+async def prewarm_dish_cache(interval=PREWARM_INTERVAL):
+    # фоновый прогрев: те же страны, что выдаёт /ran_country, по одной раз в interval секунд
+    warmed = 0
+    for country in pycountry.countries:
+        if dish_index.get(country.name) is not None or await dish_cache.get(country.name) is not None:
+            continue
+        await get_cached_dishes(country.name)
+        warmed += 1
+        await asyncio.sleep(interval)
+    logger.info(f"Dish cache prewarm finished, {warmed} countries fetched")
 
 
 async def food_seach(update, context):
     country = context.user_data["country"]
-    dishes = get_dishes_by_country(country)
+    dishes = await get_cached_dishes(country)
     if dishes:
         await update.message.reply_text(f"Блюда из {country}:")
         for i, dish in enumerate(dishes, 1):
@@ -0,0 +1,182 @@
+"""
+Разбор хтмл для /food: блюда со страниц википедии и других сайтов, ссылки из выдачи гугла.
+Только парсинг, без сети и базы, поэтому его можно гонять отдельно (bench_food.py, dish_index.py).
+"""
+
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# lxml парсит в разы быстрее встроенного html.parser, но он необязательный
+try:
+    import lxml.html
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# из больших страниц строим дерево только для нужной части
+WIKI_CONTENT = SoupStrainer(id='mw-content-text')
+LISTS_ONLY = SoupStrainer('ul')
+LINKS_ONLY = SoupStrainer('a', href=True)
+
+HEADINGS = ('h2', 'h3', 'h4')
+EDIT_RE = re.compile(r'\[edit\]', re.I)
+FOOTNOTE_RE = re.compile(r'\[\d+\]')
+
+RELEVANT_SECTIONS = (
+    "dish",
+    "food",
+    "cuisine",
+    "meal",
+    "recipe",
+    "specialty",
+    "appetizer",
+    "dessert",
+    "snack"
+)
+
+
+def make_soup(html, parse_only=None):
+    return BeautifulSoup(html, HTML_PARSER, parse_only=parse_only)
+
+
+def unique_items(items, max_items):
+    # убираем повторы, сохраняя порядок
+    return list(dict.fromkeys(items))[:max_items]
+
+
+def short_item(text):
+    # текст пункта без сносок, если это короткое название, иначе None
+    text = FOOTNOTE_RE.sub('', text)
+    return text if 1 <= len(text.split()) <= 7 else None
+
+
+def is_relevant_heading(heading_text):
+    heading_text = EDIT_RE.sub('', heading_text).lower()
+    return any(keyword in heading_text for keyword in RELEVANT_SECTIONS)
+
+
+def list_item_texts(ul):
+    # текст пунктов списка без сносок, только короткие названия
+    for li in ul.find_all('li', recursive=False):
+        text = short_item(li.get_text(separator=' ', strip=True))
+        if text:
+            yield text
+
+
+# раздел заканчивается на следующем заголовке любого уровня или на <hr>, как и раньше
+SECTION_BREAKS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr')
+
+
+def is_heading_wrapper(tag):
+    # новая разметка википедии оборачивает заголовок в <div class="mw-heading">
+    return tag.name == 'div' and 'mw-heading' in (tag.get('class') or ())
+
+
+def parse_dishes_sections(html, max_items=5):
+    # фильтрация хтмл и нахождение из хтмл блюда и тому пдобное
+    if HTML_PARSER == 'lxml':
+        return _parse_dishes_sections_lxml(html, max_items)
+
+    content = make_soup(html, WIKI_CONTENT).find(id='mw-content-text')
+    if not content:
+        return []
+
+    items = []
+    for header in content.find_all(HEADINGS):
+        if not is_relevant_heading(header.get_text(separator=" ", strip=True)):
+            continue
+
+        anchor = header.parent if is_heading_wrapper(header.parent) else header
+        for sibling in anchor.find_next_siblings():
+            if sibling.name in SECTION_BREAKS or is_heading_wrapper(sibling):
+                break
+            if sibling.name == 'ul':
+                items.extend(list_item_texts(sibling))
+            if len(items) >= max_items * 2:
+                break
+        if len(items) >= max_items * 2:
+            break
+
+    return unique_items(items, max_items)
+
+
+# строки внутри этих тегов get_text из bs4 не считает текстом
+_SKIP_TEXT_TAGS = ('script', 'style', 'template')
+
+
+def _lxml_strings(element):
+    # то же, что строки для get_text в bs4: без комментариев и содержимого script/style
+    if element.text:
+        yield element.text
+    for child in element:
+        if isinstance(child.tag, str) and child.tag not in _SKIP_TEXT_TAGS:
+            yield from _lxml_strings(child)
+        if child.tail:
+            yield child.tail
+
+
+def _lxml_text(element):
+    # аналог get_text(separator=' ', strip=True)
+    return ' '.join(text for text in (s.strip() for s in _lxml_strings(element)) if text)
+
+
+def _lxml_is_heading_wrapper(element):
+    return element.tag == 'div' and 'mw-heading' in (element.get('class') or '').split()
+
+
+def _parse_dishes_sections_lxml(html, max_items):
+    # тот же обход разделов, но прямо по дереву lxml, без построения дерева bs4
+    if not html.strip():
+        return []
+    content = lxml.html.document_fromstring(html).find('.//*[@id="mw-content-text"]')
+    if content is None:
+        return []
+
+    items = []
+    for header in content.iter(*HEADINGS):
+        if not is_relevant_heading(_lxml_text(header)):
+            continue
+
+        parent = header.getparent()
+        anchor = parent if _lxml_is_heading_wrapper(parent) else header
+        for sibling in anchor.itersiblings():
+            if not isinstance(sibling.tag, str):
+                continue
+            if sibling.tag in SECTION_BREAKS or _lxml_is_heading_wrapper(sibling):
+                break
+            if sibling.tag == 'ul':
+                for li in sibling.iterchildren('li'):
+                    text = short_item(_lxml_text(li))
+                    if text:
+                        items.append(text)
+            if len(items) >= max_items * 2:
+                break
+        if len(items) >= max_items * 2:
+            break
+
+    return unique_items(items, max_items)
+
+
+def parse_general_dishes(html, max_items=5):
+    # ассматривается хтмл запрос и ищутся нужные вещи
+    items = []
+    for ul in make_soup(html, LISTS_ONLY).find_all('ul'):
+        items.extend(list_item_texts(ul))
+        if len(items) >= max_items * 3:
+            break
+    return unique_items(items, max_items)
+
+
+def parse_search_links(html, max_results=5):
+    # из выдачи гугла достаются ссылки на результаты
+    links = {}
+    for a in make_soup(html, LINKS_ONLY).find_all('a', href=True):
+        href = a['href']
+        if href.startswith("/url?q="):
+            url = href.split("/url?q=")[1].split("&")[0]
+            if url:
+                links[url] = None
+            if len(links) >= max_results:
+                break
+    return list(links)
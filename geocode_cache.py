@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Geocoding cache for the Telegram Travel Bot.
+Keeps resolved coordinates in an in-memory LRU in front of a persistent
+SQLite table, so repeated locations skip the Yandex Geocoder entirely.
+"""
+
+import logging
+import sqlite3
+import time
+from typing import Dict, Optional, Tuple
+
+from caching import TTLCache
+from database import db
+
+# === Logging ===
+logger = logging.getLogger(__name__)
+
+# === Constants ===
+# Defaults, overridable through the [cache] section of config.ini
+DEFAULT_TTL = 30 * 24 * 60 * 60  # 30 days
+DEFAULT_MAXSIZE = 1024
+
+
+def normalize_location(location_name: str) -> str:
+    """Normalize a location query so 'moscow ' and 'Moscow' share one entry."""
+    return ' '.join(location_name.casefold().split())
+
+
+class GeocodeCache:
+    """Two-level (memory + SQLite) cache of location name -> (lat, lon)."""
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, ttl: float = DEFAULT_TTL):
+        self.ttl = ttl
+        self.memory = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.disk_hits = 0
+        self.misses = 0
+        self._setup_table()
+
+    def _setup_table(self) -> None:
+        """Create the geocode cache table if it doesn't exist."""
+        try:
+            db.run_sync(lambda conn: conn.execute('''
+                CREATE TABLE IF NOT EXISTS geocode_cache (
+                    query TEXT PRIMARY KEY,
+                    lat REAL NOT NULL,
+                    lon REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            '''))
+        except sqlite3.Error as e:
+            logger.error(f"Database error setting up geocode cache: {e}")
+
+    async def get(self, location_name: str) -> Optional[Tuple[float, float]]:
+        """
+        Look up cached coordinates.
+
+        Args:
+            location_name: Location as typed by the user
+
+        Returns:
+            (lat, lon) tuple, or None on a miss
+        """
+        key = normalize_location(location_name)
+        coords = self.memory.get(key)
+        if coords is not None:
+            return coords
+
+        try:
+            row = await db.fetchone(
+                'SELECT lat, lon, updated_at FROM geocode_cache WHERE query = ?',
+                (key,)
+            )
+        except sqlite3.Error as e:
+            logger.error(f"Database error reading geocode cache: {e}")
+            row = None
+
+        if row is None or row[2] + self.ttl <= time.time():
+            self.misses += 1
+            return None
+
+        coords = (row[0], row[1])
+        # Only keep the entry in memory for the rest of its on-disk lifetime
+        self.memory.set(key, coords, ttl=row[2] + self.ttl - time.time())
+        self.disk_hits += 1
+        return coords
+
+    async def set(self, location_name: str, coords: Tuple[float, float]) -> None:
+        """Store coordinates in memory and on disk."""
+        key = normalize_location(location_name)
+        self.memory.set(key, coords)
+        try:
+            await db.execute(
+                '''INSERT INTO geocode_cache (query, lat, lon, updated_at)
+                   VALUES (?, ?, ?, ?)
+                   ON CONFLICT(query)
+                   DO UPDATE SET lat = excluded.lat, lon = excluded.lon,
+                                 updated_at = excluded.updated_at''',
+                (key, coords[0], coords[1], time.time())
+            )
+        except sqlite3.Error as e:
+            logger.error(f"Database error writing geocode cache: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters for both cache levels."""
+        return {
+            'memory_hits': self.memory.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'size': len(self.memory),
+        }
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Shared asynchronous HTTP client for the Telegram Travel Bot.
+Keeps one pooled aiohttp session for all outbound API calls, so requests
+reuse keep-alive connections and never block the event loop.
+"""
+
+import asyncio
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+# === Constants ===
+# Default total timeout (seconds) for a single request
+DEFAULT_TIMEOUT = 10
+
+# Connection pool size shared by every host
+POOL_LIMIT = 100
+
+# How many requests may be in flight to one host at the same time
+DEFAULT_HOST_LIMIT = 10
+
+# Per-host overrides for the concurrency limit
+HOST_LIMITS = {
+    'test.api.amadeus.com': 5,
+    'translate.googleapis.com': 5,
+}
+
+# Errors callers should treat as "the upstream call failed"
+HTTP_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
+
+_session: Optional[aiohttp.ClientSession] = None
+_host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """Return the shared client session, creating it on first use."""
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=POOL_LIMIT,
+            limit_per_host=max([DEFAULT_HOST_LIMIT, *HOST_LIMITS.values()]),
+            ttl_dns_cache=300,
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT),
+        )
+    return _session
+
+
+def _host_semaphore(url: str) -> asyncio.Semaphore:
+    """Get the concurrency limiter for the host of the given URL."""
+    host = urlsplit(url).hostname or ''
+    semaphore = _host_semaphores.get(host)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(HOST_LIMITS.get(host, DEFAULT_HOST_LIMIT))
+        _host_semaphores[host] = semaphore
+    return semaphore
+
+
+def _timeout(timeout: Optional[float]) -> Optional[aiohttp.ClientTimeout]:
+    """Build a per-request timeout, or None to use the session default."""
+    if timeout is None:
+        return None
+    return aiohttp.ClientTimeout(total=timeout)
+
+
+async def request_json(method: str, url: str, *,
+                       params: Optional[Dict[str, Any]] = None,
+                       data: Optional[Dict[str, Any]] = None,
+                       headers: Optional[Dict[str, str]] = None,
+                       timeout: Optional[float] = None) -> Any:
+    """
+    Perform an HTTP request and decode the JSON body.
+
+    Args:
+        method: HTTP method ('GET', 'POST', ...)
+        url: Request URL
+        params: Query string parameters
+        data: Form body
+        headers: Extra request headers
+        timeout: Total timeout in seconds (defaults to DEFAULT_TIMEOUT)
+
+    Returns:
+        Decoded JSON payload
+
+    Raises:
+        aiohttp.ClientError, asyncio.TimeoutError: on network or HTTP errors
+    """
+    session = await get_session()
+    async with _host_semaphore(url):
+        async with session.request(method, url, params=params, data=data,
+                                   headers=headers, timeout=_timeout(timeout)) as response:
+            response.raise_for_status()
+            # Some APIs (Google Translate) answer JSON with a text/* content type
+            return await response.json(content_type=None)
+
+
+async def get_json(url: str, **kwargs) -> Any:
+    """Shorthand for a GET request returning JSON."""
+    return await request_json('GET', url, **kwargs)
+
+
+async def post_json(url: str, **kwargs) -> Any:
+    """Shorthand for a POST request returning JSON."""
+    return await request_json('POST', url, **kwargs)
+
+
+async def get_text(url: str, *,
+                   params: Optional[Dict[str, Any]] = None,
+                   headers: Optional[Dict[str, str]] = None,
+                   timeout: Optional[float] = None) -> str:
+    """
+    Perform a GET request and return the response body as text.
+
+    Raises:
+        aiohttp.ClientError, asyncio.TimeoutError: on network or HTTP errors
+    """
+    session = await get_session()
+    async with _host_semaphore(url):
+        async with session.get(url, params=params, headers=headers,
+                               timeout=_timeout(timeout)) as response:
+            response.raise_for_status()
+            return await response.text()
+
+
+async def close_session() -> None:
+    """Close the shared session and release pooled connections."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    _host_semaphores.clear()
@@ -9,7 +9,8 @@ import json
 import logging
 import os
 import sqlite3
-from typing import Dict, Optional, Tuple
+import time
+from typing import Dict, List, Mapping, Optional, Pattern, Sequence, Tuple, Union
 import re
 
 import requests
@@ -17,6 +18,9 @@ from telegram import Update
 import langid
 from langdetect import detect_langs
 
+from caching import TTLCache
+from database import db
+
 # === Configure Logging ===
 logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -25,7 +29,6 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # === Constants ===
-DB_PATH = 'finalproject.db'
 TRANSLATIONS_DIR = 'translations'
 
 # Default language if not set
@@ -47,6 +50,23 @@ SUPPORTED_LANGUAGES = {
 
 DETECTION_CONFIDENCE_THRESHOLD = 0.80
 
+# How many users' language preferences are kept in memory
+USER_LANGUAGE_CACHE_SIZE = 10000
+
+# How often (seconds) translation files are checked for changes
+RELOAD_CHECK_INTERVAL = 5
+
+# Placeholders like {name} or {0} inside translation keys
+PLACEHOLDER_RE = re.compile(r'\{([^{}]*)\}')
+
+# How many leading literal characters of a template are used as index key
+TEMPLATE_PREFIX_LENGTH = 8
+
+
+
+# In-process cache of user_id -> language code (LRU, no expiry:
+# every change goes through set_user_language)
+user_language_cache = TTLCache(maxsize=USER_LANGUAGE_CACHE_SIZE)
 
 
 # === Database Functions ===
@@ -54,16 +74,13 @@ DETECTION_CONFIDENCE_THRESHOLD = 0.80
 def setup_language_table():
     """Create language preferences table if it doesn't exist."""
     try:
-        with sqlite3.connect(DB_PATH) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS user_language (
-                    user_id INTEGER PRIMARY KEY,
-                    language_code TEXT NOT NULL DEFAULT 'en'
-                )
-            ''')
-            conn.commit()
-            logger.info("Language table setup complete")
+        db.run_sync(lambda conn: conn.execute('''
+            CREATE TABLE IF NOT EXISTS user_language (
+                user_id INTEGER PRIMARY KEY,
+                language_code TEXT NOT NULL DEFAULT 'en'
+            )
+        '''))
+        logger.info("Language table setup complete")
     except sqlite3.Error as e:
         logger.error(f"Database error setting up language table: {e}")
 
@@ -78,25 +95,27 @@ async def get_user_language(user_id: int) -> str:
     Returns:
         Language code (e.g., 'en', 'es')
     """
+    cached = user_language_cache.get(user_id)
+    if cached is not None:
+        return cached
+
     try:
-        with sqlite3.connect(DB_PATH) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                'SELECT language_code FROM user_language WHERE user_id = ?',
-                (user_id,)
+        result = await db.fetchone(
+            'SELECT language_code FROM user_language WHERE user_id = ?',
+            (user_id,)
+        )
+
+        if result:
+            user_language_cache.set(user_id, result[0])
+            return result[0]
+        else:
+            # If user doesn't have a language set, add default
+            await db.execute(
+                'INSERT OR IGNORE INTO user_language (user_id, language_code) VALUES (?, ?)',
+                (user_id, DEFAULT_LANGUAGE)
             )
-            result = cursor.fetchone()
-
-            if result:
-                return result[0]
-            else:
-                # If user doesn't have a language set, add default
-                cursor.execute(
-                    'INSERT INTO user_language (user_id, language_code) VALUES (?, ?)',
-                    (user_id, DEFAULT_LANGUAGE)
-                )
-                conn.commit()
-                return DEFAULT_LANGUAGE
+            user_language_cache.set(user_id, DEFAULT_LANGUAGE)
+            return DEFAULT_LANGUAGE
 
     except sqlite3.Error as e:
         logger.error(f"Database error getting user language: {e}")
@@ -118,17 +137,16 @@ async def set_user_language(user_id: int, language_code: str) -> bool:
         return False
 
     try:
-        with sqlite3.connect(DB_PATH) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                '''INSERT INTO user_language (user_id, language_code) 
-                   VALUES (?, ?)
-                   ON CONFLICT(user_id) 
-                   DO UPDATE SET language_code = ?''',
-                (user_id, language_code, language_code)
-            )
-            conn.commit()
-            return True
+        await db.execute(
+            '''INSERT INTO user_language (user_id, language_code) 
+               VALUES (?, ?)
+               ON CONFLICT(user_id) 
+               DO UPDATE SET language_code = ?''',
+            (user_id, language_code, language_code)
+        )
+        # Write-through so the next lookup doesn't hit the database
+        user_language_cache.set(user_id, language_code)
+        return True
     except sqlite3.Error as e:
         logger.error(f"Database error setting user language: {e}")
         return False
@@ -136,17 +154,17 @@ async def set_user_language(user_id: int, language_code: str) -> bool:
 
 # === Translation Functions ===
 
-def load_translation_file(language_code: str) -> Dict:
+def translation_file_path(language_code: str) -> Optional[str]:
     """
-    Load translation strings from file.
+    Find the translation file for a language.
 
     Args:
-        language_code: Language code to load
+        language_code: Language code to look up
 
     Returns:
-        Dictionary of translated strings
+        Path of the first existing file, or None
     """
-    # First try to load from translations directory
+    # First try the translations directory
     translation_paths = [
         os.path.join(TRANSLATIONS_DIR, f"{language_code}.json"),  # Standard path
         f"{language_code}.json"  # Root directory fallback
@@ -154,11 +172,27 @@ def load_translation_file(language_code: str) -> Dict:
 
     for file_path in translation_paths:
         if os.path.exists(file_path):
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, FileNotFoundError) as e:
-                logger.error(f"Error loading translation file {file_path}: {e}")
+            return file_path
+    return None
+
+
+def load_translation_file(language_code: str) -> Dict:
+    """
+    Load translation strings from file.
+
+    Args:
+        language_code: Language code to load
+
+    Returns:
+        Dictionary of translated strings
+    """
+    file_path = translation_file_path(language_code)
+    if file_path:
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError) as e:
+            logger.error(f"Error loading translation file {file_path}: {e}")
 
     # If we get here, no valid translation file was found
     if language_code != DEFAULT_LANGUAGE:
@@ -169,6 +203,138 @@ def load_translation_file(language_code: str) -> Dict:
         return {}
 
 
+class TemplateIndex:
+    """
+    Placeholder templates of one language, compiled once.
+
+    Entries like "Hello, {name}!" become anchored regexes and are bucketed
+    by word count and the first characters of their literal prefix, so a
+    lookup only tries the few templates that can possibly match.
+    """
+
+    def __init__(self, translations: Dict[str, str]):
+        self._buckets: Dict[Tuple[int, str], List[Tuple[Pattern, List[str], str]]] = {}
+        self._prefix_lengths: Dict[int, List[int]] = {}
+
+        for original, translated in translations.items():
+            parts = PLACEHOLDER_RE.split(original)
+            if len(parts) == 1:
+                continue
+
+            # parts alternate literal text and placeholder names
+            literals, names = parts[0::2], parts[1::2]
+            pattern = re.compile('(.+?)'.join(re.escape(literal) for literal in literals), re.DOTALL)
+            names = [name or str(i) for i, name in enumerate(names)]
+            word_count = len(original.split())
+            prefix = literals[0][:TEMPLATE_PREFIX_LENGTH]
+
+            self._buckets.setdefault((word_count, prefix), []).append((pattern, names, translated))
+            lengths = self._prefix_lengths.setdefault(word_count, [])
+            if len(prefix) not in lengths:
+                lengths.append(len(prefix))
+
+        for lengths in self._prefix_lengths.values():
+            lengths.sort(reverse=True)
+
+    def match(self, text: str) -> Optional[str]:
+        """
+        Translate text that was produced from one of the templates.
+
+        Args:
+            text: Already formatted text
+
+        Returns:
+            Translated text with placeholder values filled in, or None
+        """
+        word_count = len(text.split())
+        for length in self._prefix_lengths.get(word_count, ()):
+            for pattern, names, translated in self._buckets.get((word_count, text[:length]), ()):
+                match = pattern.fullmatch(text)
+                if match:
+                    result = translated
+                    for name, value in zip(names, match.groups()):
+                        result = result.replace(f"{{{name}}}", value)
+                    return result
+        return None
+
+
+class TranslationCatalog:
+    """
+    In-memory translation strings for every supported language.
+
+    Files are parsed once at startup. At most every ``check_interval``
+    seconds the catalog compares file modification times and re-reads
+    only the files that changed; ``reload()`` forces a re-read.
+    """
+
+    def __init__(self, check_interval: float = RELOAD_CHECK_INTERVAL):
+        self.check_interval = check_interval
+        self._translations: Dict[str, Dict] = {}
+        self._templates: Dict[str, TemplateIndex] = {}
+        # language code -> (source file path or None, mtime)
+        self._sources: Dict[str, Tuple[Optional[str], float]] = {}
+        self._last_check = time.monotonic()
+        self.reload()
+
+    def _load(self, language_code: str) -> None:
+        """(Re)load one language and remember where it came from."""
+        file_path = translation_file_path(language_code)
+        mtime = os.path.getmtime(file_path) if file_path else 0.0
+        translations = load_translation_file(language_code)
+        self._translations[language_code] = translations
+        self._templates[language_code] = TemplateIndex(translations)
+        self._sources[language_code] = (file_path, mtime)
+
+    def reload(self, language_code: Optional[str] = None) -> None:
+        """
+        Re-read translation files.
+
+        Args:
+            language_code: Language to reload; all supported languages if None
+        """
+        codes = [language_code] if language_code else list(SUPPORTED_LANGUAGES)
+        for code in codes:
+            self._load(code)
+        logger.info(f"Loaded translations for: {', '.join(codes)}")
+
+    def _reload_changed(self) -> None:
+        """Reload languages whose file changed, appeared or disappeared."""
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return
+        self._last_check = now
+
+        for code, (file_path, mtime) in list(self._sources.items()):
+            current_path = translation_file_path(code)
+            try:
+                current_mtime = os.path.getmtime(current_path) if current_path else 0.0
+            except OSError:
+                current_mtime = 0.0
+            if current_path != file_path or current_mtime != mtime:
+                logger.info(f"Translation file for {code} changed, reloading")
+                self._load(code)
+
+    def get(self, language_code: str) -> Dict:
+        """
+        Get the translation strings for a language.
+
+        Args:
+            language_code: Language code
+
+        Returns:
+            Dictionary of translated strings
+        """
+        self._reload_changed()
+        if language_code not in self._translations:
+            self._load(language_code)
+        return self._translations[language_code]
+
+    def templates(self, language_code: str) -> TemplateIndex:
+        """Get the precompiled placeholder templates for a language."""
+        self.get(language_code)
+        return self._templates[language_code]
+
+
 def translate_string(text: str, language_code: str) -> str:
     """
     Translate a string to the target language.
@@ -187,30 +353,18 @@ def translate_string(text: str, language_code: str) -> str:
     if language_code == DEFAULT_LANGUAGE:
         return text
 
-    # Look up in translation files
-    translations = load_translation_file(language_code)
+    # Look up in the preloaded catalog
+    translations = catalog.get(language_code)
 
     # If we have a direct translation, use it
     if text in translations:
         return translations[text]
 
-    # Format strings with placeholders won't be exact matches
-    # Let's try to find partial matches for format strings
-    if '{' in text and '}' in text:
-        for original, translated in translations.items():
-            if ('{' in original and '}' in original and
-                    len(original.split()) == len(text.split())):
-                # Replace placeholders with regex patterns
-                pattern = re.escape(original).replace('\\{.*?\\}', '(.*?)')
-                match = re.match(pattern, text)
-                if match:
-                    # Extract values and format the translated string
-                    values = match.groups()
-                    result = translated
-                    for i, value in enumerate(values):
-                        placeholder = f"{{{i}}}"
-                        result = result.replace(placeholder, value)
-                    return result
+    # Format strings with placeholders won't be exact matches,
+    # so try the precompiled templates of this language
+    translated = catalog.templates(language_code).match(text)
+    if translated is not None:
+        return translated
 
     # Return original text if translation fails
     logger.debug(f"No translation found for '{text}' in {language_code}")
@@ -264,6 +418,7 @@ def detect_language(text: str) -> str:
 
 # Initialize language support when module is loaded
 setup_language_table()
+catalog = TranslationCatalog()
 
 
 async def _(text: str, update: Update) -> str:
@@ -283,3 +438,22 @@ async def _(text: str, update: Update) -> str:
         text,
         lang_code
     )
+
+
+async def translate_batch(texts: Union[Sequence[str], Mapping[str, str]],
+                          update: Update) -> Union[List[str], Dict[str, str]]:
+    """
+    Translate many strings for one user, resolving the language only once.
+
+    Args:
+        texts: List of texts, or dict of key -> text
+        update: Telegram update object to get user ID
+
+    Returns:
+        List of translations in the same order, or dict with the same keys
+    """
+    user_id = update.effective_user.id
+    lang_code = await get_user_language(user_id)
+    if isinstance(texts, Mapping):
+        return {key: translate_string(text, lang_code) for key, text in texts.items()}
+    return [translate_string(text, lang_code) for text in texts]
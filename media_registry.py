@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Telegram media registry for the Telegram Travel Bot.
+Maps static asset paths to the file_id Telegram assigned on first upload
+and keeps the mapping in SQLite, so later sends transfer zero bytes.
+"""
+
+import logging
+import os
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional
+
+from telegram import Bot, Message
+from telegram.error import BadRequest
+
+from database import db
+
+# === Logging ===
+logger = logging.getLogger(__name__)
+
+# === Constants ===
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Bot method and Message attribute for each kind of media
+MEDIA_KINDS = {
+    'audio': 'send_audio',
+    'photo': 'send_photo',
+}
+
+# Fragments of the BadRequest messages that mean the stored file_id itself is
+# no longer usable ("Wrong file identifier/http url specified", ...)
+STALE_FILE_ID_ERRORS = (
+    'wrong file identifier',
+    'wrong remote file identifier',
+    'file reference',
+    'type of file mismatch',
+)
+
+
+def _is_stale_file_id(error: BadRequest) -> bool:
+    """Whether Telegram rejected the request because of the file_id."""
+    message = error.message.lower().replace('_', ' ')
+    return any(fragment in message for fragment in STALE_FILE_ID_ERRORS)
+
+
+def _uploaded_file_id(message: Message, kind: str) -> Optional[str]:
+    """Extract the file_id Telegram assigned to uploaded media."""
+    if kind == 'photo':
+        return message.photo[-1].file_id if message.photo else None
+    media = getattr(message, kind, None)
+    return media.file_id if media else None
+
+
+class MediaRegistry:
+    """Persistent asset path -> Telegram file_id mapping."""
+
+    def __init__(self):
+        self.file_ids: Dict[str, str] = {}
+        try:
+            db.run_sync(lambda conn: conn.execute('''
+                CREATE TABLE IF NOT EXISTS media_file_ids (
+                    path TEXT PRIMARY KEY,
+                    file_id TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            '''))
+            rows = db.run_sync(lambda conn: conn.execute(
+                'SELECT path, file_id FROM media_file_ids'
+            ).fetchall())
+            self.file_ids.update(rows)
+        except sqlite3.Error as e:
+            logger.error(f"Database error loading media registry: {e}")
+
+    def file_id(self, path: str) -> Optional[str]:
+        """Get the known file_id for an asset, if it was uploaded before."""
+        return self.file_ids.get(path)
+
+    async def remember(self, path: str, file_id: str, kind: str) -> None:
+        """Store the file_id of an uploaded asset in memory and on disk."""
+        self.file_ids[path] = file_id
+        try:
+            await db.execute(
+                '''INSERT INTO media_file_ids (path, file_id, kind, updated_at)
+                   VALUES (?, ?, ?, ?)
+                   ON CONFLICT(path)
+                   DO UPDATE SET file_id = excluded.file_id, kind = excluded.kind,
+                                 updated_at = excluded.updated_at''',
+                (path, file_id, kind, time.time())
+            )
+        except sqlite3.Error as e:
+            logger.error(f"Database error saving media file_id: {e}")
+
+    async def forget(self, path: str) -> None:
+        """Drop a file_id Telegram no longer accepts."""
+        self.file_ids.pop(path, None)
+        try:
+            await db.execute('DELETE FROM media_file_ids WHERE path = ?', (path,))
+        except sqlite3.Error as e:
+            logger.error(f"Database error removing media file_id: {e}")
+
+    def missing_assets(self, paths: Iterable[str]) -> List[str]:
+        """Return the asset paths that don't exist on disk."""
+        return [path for path in paths if not os.path.isfile(os.path.join(BASE_DIR, path))]
+
+    async def send(self, bot: Bot, chat_id: int, path: str, kind: str,
+                   data: Optional[bytes] = None, **kwargs) -> Message:
+        """
+        Send an asset by file_id if known, otherwise upload it and remember the id.
+
+        A stored file_id that Telegram rejects as invalid is forgotten and the
+        asset is uploaded again; any other BadRequest is raised.
+
+        Args:
+            bot: Bot instance
+            chat_id: Target chat
+            path: Asset path relative to the project directory
+            kind: 'audio' or 'photo'
+            data: Asset contents already in memory; uploaded instead of reading path
+            **kwargs: Extra arguments for the Bot send method (caption, ...)
+
+        Returns:
+            The sent message
+
+        Raises:
+            FileNotFoundError: if the asset must be uploaded but doesn't exist
+            BadRequest: if Telegram rejects the request for another reason
+        """
+        send_method = getattr(bot, MEDIA_KINDS[kind])
+
+        file_id = self.file_ids.get(path)
+        if file_id:
+            try:
+                return await send_method(chat_id, file_id, **kwargs)
+            except BadRequest as e:
+                if not _is_stale_file_id(e):
+                    raise
+                logger.warning(f"Stored file_id for {path} rejected ({e}), uploading again")
+                await self.forget(path)
+
+        if data is not None:
+            message = await send_method(chat_id, data, **kwargs)
+        else:
+            with open(os.path.join(BASE_DIR, path), 'rb') as media_file:
+                message = await send_method(chat_id, media_file, **kwargs)
+
+        uploaded_id = _uploaded_file_id(message, kind)
+        if uploaded_id:
+            await self.remember(path, uploaded_id, kind)
+        return message
+
+    async def send_audio(self, bot: Bot, chat_id: int, path: str, **kwargs) -> Message:
+        """Send an audio asset (see send())."""
+        return await self.send(bot, chat_id, path, 'audio', **kwargs)
+
+    async def send_photo(self, bot: Bot, chat_id: int, path: str, **kwargs) -> Message:
+        """Send a photo asset (see send())."""
+        return await self.send(bot, chat_id, path, 'photo', **kwargs)
+
+    async def warm_up(self, bot: Bot, chat_id: int, assets: Dict[str, str]) -> int:
+        """
+        Upload every asset that has no file_id yet.
+
+        Each upload goes to chat_id and the message is deleted right away;
+        the file_id stays valid.
+
+        Args:
+            bot: Bot instance
+            chat_id: Chat used for the uploads
+            assets: Mapping of asset path -> kind
+
+        Returns:
+            Number of assets uploaded
+        """
+        uploaded = 0
+        for path, kind in assets.items():
+            if path in self.file_ids:
+                continue
+            try:
+                message = await self.send(bot, chat_id, path, kind)
+            except FileNotFoundError:
+                logger.warning(f"Media asset not found: {path}")
+                continue
+            await message.delete()
+            uploaded += 1
+        return uploaded
+
+
+media_registry = MediaRegistry()
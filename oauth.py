@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+OAuth2 client-credentials token manager for the Telegram Travel Bot.
+Caches the access token until shortly before it expires, refreshes it in
+the background while the current one is still valid, and lets concurrent
+callers share a single in-flight token request.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from http_client import HTTP_ERRORS, post_json
+
+# === Logging ===
+logger = logging.getLogger(__name__)
+
+# === Constants ===
+# Stop using a token this many seconds before it expires
+EXPIRY_MARGIN = 60
+
+# Start a background refresh this many seconds before the margin is reached
+REFRESH_AHEAD = 300
+
+# After a failed background refresh, wait this long before trying again
+# (only while the current token is still valid)
+REFRESH_RETRY_BACKOFF = 30
+
+# Used when the server doesn't say how long the token lives
+DEFAULT_EXPIRES_IN = 1799
+
+TOKEN_TIMEOUT = 10
+
+
+class OAuthTokenManager:
+    """Cached client-credentials access token for one OAuth2 endpoint."""
+
+    def __init__(self, token_url: str, client_id: str, client_secret: str,
+                 margin: float = EXPIRY_MARGIN, refresh_ahead: float = REFRESH_AHEAD,
+                 retry_backoff: float = REFRESH_RETRY_BACKOFF):
+        self.token_url = token_url
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.margin = margin
+        self.refresh_ahead = refresh_ahead
+        self.retry_backoff = retry_backoff
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+        self._refresh: Optional[asyncio.Task] = None
+        self._failed_at: Optional[float] = None
+        self.fetches = 0
+
+    def _valid_for(self) -> float:
+        """Seconds the cached token may still be used (<= 0 if unusable)."""
+        if self._token is None:
+            return 0.0
+        return self._expires_at - self.margin - time.monotonic()
+
+    async def _fetch(self) -> Optional[str]:
+        """Request a new token from the server and cache it."""
+        self.fetches += 1
+        try:
+            data = await post_json(self.token_url, data={
+                'grant_type': 'client_credentials',
+                'client_id': self.client_id,
+                'client_secret': self.client_secret,
+            }, timeout=TOKEN_TIMEOUT)
+            token = data['access_token']
+            expires_in = float(data.get('expires_in', DEFAULT_EXPIRES_IN))
+        except (*HTTP_ERRORS, KeyError, ValueError) as e:
+            logger.error(f"OAuth token error for {self.token_url}: {e}")
+            self._failed_at = time.monotonic()
+            return None
+
+        self._token = token
+        self._expires_at = time.monotonic() + expires_in
+        self._failed_at = None
+        return token
+
+    def _backing_off(self) -> bool:
+        """Whether the last refresh failed less than ``retry_backoff`` seconds ago."""
+        return (self._failed_at is not None
+                and time.monotonic() - self._failed_at < self.retry_backoff)
+
+    def _start_refresh(self) -> asyncio.Task:
+        """Return the in-flight refresh, starting one if none is running."""
+        if self._refresh is None or self._refresh.done():
+            self._refresh = asyncio.create_task(self._fetch())
+        return self._refresh
+
+    async def get_token(self) -> Optional[str]:
+        """
+        Get a usable access token.
+
+        Returns the cached token while it is valid; within ``refresh_ahead``
+        seconds of expiry a replacement is fetched in the background. A
+        failed background refresh isn't retried for ``retry_backoff``
+        seconds; once the token is unusable every call may fetch again.
+
+        Returns:
+            Access token, or None if it couldn't be obtained
+        """
+        valid_for = self._valid_for()
+        if valid_for > 0:
+            if valid_for <= self.refresh_ahead and not self._backing_off():
+                self._start_refresh()
+            return self._token
+
+        # Shield the shared request so one cancelled caller doesn't cancel it for all
+        return await asyncio.shield(self._start_refresh())
+
+    def invalidate(self) -> None:
+        """Forget the cached token, e.g. after the API rejected it with 401."""
+        self._token = None
+        self._expires_at = 0.0
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+User profile loader for the Telegram Travel Bot.
+Fetches a registered user's row from logining together with the resolved
+zodiac name in one query and keeps it in memory until it changes.
+"""
+
+from typing import Any, Dict, Optional, Union
+
+from caching import TTLCache
+from database import db
+
+# === Constants ===
+# How many profiles are kept in memory
+PROFILE_CACHE_SIZE = 5000
+
+PROFILE_FIELDS = ('login', 'gender', 'day', 'month', 'year', 'znak_zodiac_id', 'zodiac_name')
+
+PROFILE_SQL = '''
+    SELECT logining.login, logining.gender, logining.day, logining.month,
+           logining.year, logining.znak_zodiac_id, zodiac_idshnik.zodiac_name
+    FROM logining
+    LEFT JOIN zodiac ON logining.znak_zodiac_id = zodiac.znak_zodiac_id
+    LEFT JOIN zodiac_idshnik ON zodiac.zodiac_id = zodiac_idshnik.zodiac_id
+    WHERE logining.login = ?
+'''
+
+profile_cache = TTLCache(maxsize=PROFILE_CACHE_SIZE)
+
+
+async def load_profile(login: Union[int, str]) -> Optional[Dict[str, Any]]:
+    """
+    Load a user profile, from memory if possible.
+
+    Args:
+        login: User login (Telegram user ID)
+
+    Returns:
+        Dict with PROFILE_FIELDS keys, or None if the user isn't registered
+
+    Raises:
+        sqlite3.Error: if the query fails
+    """
+    key = str(login)
+    profile = profile_cache.get(key)
+    if profile is not None:
+        return profile
+
+    row = await db.fetchone(PROFILE_SQL, (key,))
+    if row is None:
+        return None
+
+    profile = dict(zip(PROFILE_FIELDS, row))
+    profile_cache.set(key, profile)
+    return profile
+
+
+def invalidate_profile(login: Union[int, str]) -> None:
+    """Drop a cached profile after the user's row has been written."""
+    profile_cache.pop(str(login))
@@ -6,7 +6,6 @@ Handles user registration flow and database operations.
 
 import logging
 import sqlite3
-from astro import zodiac_detect
 from datetime import datetime
 from typing import Optional, Tuple
 
@@ -20,11 +19,12 @@ from telegram.ext import (
     filters, Application,
 )
 
+from database import db
+from profiles import invalidate_profile, load_profile
+from zodiac import LEXICONS, zodiac_id
 from language_support import _
 
 # === Constants ===
-DB_PATH = 'finalproject.db'
-
 # Registration conversation states
 ASK_PASSWORD, ASK_GENDER, ASK_BIRTHDAY = range(3)
 
@@ -41,13 +41,7 @@ logger = logging.getLogger(__name__)
 async def _user_exists(user_id: int) -> bool:
     """Check if the user is already in the database."""
     try:
-        with sqlite3.connect(DB_PATH) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                'SELECT 1 FROM logining WHERE login = ?',
-                (user_id,)
-            )
-            return cursor.fetchone() is not None
+        return await load_profile(user_id) is not None
     except sqlite3.Error as e:
         logger.error(f"Database error checking user existence: {e}")
         return False
@@ -57,27 +51,29 @@ async def _add_user(user_id: int, password: str, gender: str, birthday: datetime
     """
     Insert new user into the database.
 
+    The zodiac id is derived from gender and birthday and stored in the
+    same INSERT, so read paths never have to compute it.
+
     Returns:
         bool: True if successful, False otherwise
     """
     try:
-        with sqlite3.connect(DB_PATH) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                '''INSERT INTO logining
-                   (login, password, gender, day, month, year)
-                   VALUES (?, ?, ?, ?, ?, ?)''',
-                (
-                    user_id,
-                    password,
-                    gender,
-                    birthday.day,
-                    birthday.month,
-                    birthday.year
-                )
+        await db.execute(
+            '''INSERT INTO logining
+               (login, password, gender, day, month, year, znak_zodiac_id)
+               VALUES (?, ?, ?, ?, ?, ?, ?)''',
+            (
+                user_id,
+                password,
+                gender,
+                birthday.day,
+                birthday.month,
+                birthday.year,
+                zodiac_id(gender, birthday.day, birthday.month)
             )
-            conn.commit()
-            return True
+        )
+        invalidate_profile(user_id)
+        return True
     except sqlite3.Error as e:
         logger.error(f"Database error adding user: {e}")
         return False
@@ -186,7 +182,7 @@ reg = ConversationHandler(
     entry_points=[CommandHandler('registration', start_registration)],
     states={
         ASK_PASSWORD: [MessageHandler(filters.TEXT & ~filters.COMMAND, ask_gender)],
-        ASK_GENDER: [CallbackQueryHandler(get_gender, pattern='^(Male|Female)$')],
+        ASK_GENDER: [CallbackQueryHandler(get_gender, pattern=f"^({'|'.join(LEXICONS)})$")],
         ASK_BIRTHDAY: [MessageHandler(filters.TEXT & ~filters.COMMAND, ask_birthday)],
     },
     fallbacks=[CommandHandler('cancel', cancel)],
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Per-domain rate limiting and circuit breaking for the Telegram Travel Bot.
+Every outbound scrape first takes a token from its domain's bucket and
+checks the domain's circuit, so a rate-limited or broken upstream is
+skipped immediately instead of waiting out its timeouts.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+# === Logging ===
+logger = logging.getLogger(__name__)
+
+# === Constants ===
+# (requests per second, burst size) for each domain
+DEFAULT_RATE_LIMIT = (2.0, 5)
+RATE_LIMITS = {
+    'www.google.com': (0.5, 2),
+    'en.wikipedia.org': (5.0, 10),
+}
+
+# Consecutive failures that open a circuit, and how long it stays open
+FAILURE_THRESHOLD = 3
+RESET_TIMEOUT = 60.0
+
+# Longest a request may wait for a token before it is dropped
+MAX_TOKEN_WAIT = 2.0
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+def is_upstream_failure(error: BaseException) -> bool:
+    """
+    Decide whether an error means the upstream is unhealthy.
+
+    Timeouts, connection errors, 429 and 5xx count; other HTTP statuses
+    (a missing Wikipedia page is a 404) say nothing about the domain.
+    """
+    status = getattr(error, 'status', None)
+    return status is None or status == 429 or status >= 500
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate`` tokens per second, holding up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.granted = 0
+        self.throttled = 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, max_wait: float = MAX_TOKEN_WAIT) -> bool:
+        """
+        Take one token, sleeping until it is available.
+
+        Args:
+            max_wait: Give up instead of waiting longer than this (seconds)
+
+        Returns:
+            True if a token was taken, False if the wait would be too long
+        """
+        self._refill()
+        wait = (1 - self.tokens) / self.rate if self.tokens < 1 else 0.0
+        if wait > max_wait:
+            self.throttled += 1
+            return False
+        # Reserve the token now so concurrent callers queue up behind us
+        self.tokens -= 1
+        self.granted += 1
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker with closed, open and half-open states.
+
+    The circuit opens after ``failure_threshold`` consecutive failures and
+    rejects calls for ``reset_timeout`` seconds. Then a single trial call
+    is let through: success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = FAILURE_THRESHOLD,
+                 reset_timeout: float = RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_started: Optional[float] = None
+        self.successes = 0
+        self.failures = 0
+        self.rejected = 0
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return CLOSED
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return OPEN
+        return HALF_OPEN
+
+    def _trial_in_flight(self) -> bool:
+        # A trial whose caller was cancelled never reports back; let it expire
+        return (self._trial_started is not None
+                and time.monotonic() - self._trial_started < self.reset_timeout)
+
+    def available(self) -> bool:
+        """Whether a call could be let through now (doesn't start a trial)."""
+        state = self.state
+        return state == CLOSED or (state == HALF_OPEN and not self._trial_in_flight())
+
+    def allow(self) -> bool:
+        """Ask to make a call; in half-open state this claims the single trial."""
+        if not self.available():
+            self.rejected += 1
+            return False
+        if self.state == HALF_OPEN:
+            self._trial_started = time.monotonic()
+        return True
+
+    def record_success(self) -> None:
+        self.successes += 1
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._trial_started = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.consecutive_failures += 1
+        half_open = self.opened_at is not None
+        self._trial_started = None
+        if half_open or self.consecutive_failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            self.trips += 1
+
+
+class DomainGuards:
+    """Lazily created (TokenBucket, CircuitBreaker) pair for every domain."""
+
+    def __init__(self):
+        self._guards: Dict[str, Tuple[TokenBucket, CircuitBreaker]] = {}
+
+    def _guard(self, url: str) -> Tuple[str, TokenBucket, CircuitBreaker]:
+        host = urlsplit(url).hostname or ''
+        guard = self._guards.get(host)
+        if guard is None:
+            rate, capacity = RATE_LIMITS.get(host, DEFAULT_RATE_LIMIT)
+            guard = (TokenBucket(rate, capacity), CircuitBreaker())
+            self._guards[host] = guard
+        return (host, *guard)
+
+    def available(self, url: str) -> bool:
+        """Whether the circuit for the URL's domain would let a call through."""
+        return self._guard(url)[2].available()
+
+    async def acquire(self, url: str) -> bool:
+        """
+        Get permission to request a URL.
+
+        Returns:
+            False if the domain's circuit is open or its rate limit
+            would make the caller wait longer than MAX_TOKEN_WAIT
+        """
+        host, bucket, breaker = self._guard(url)
+        if not breaker.available():
+            breaker.rejected += 1
+            return False
+        if not await bucket.acquire():
+            logger.debug(f"Rate limit reached for {host}")
+            return False
+        return breaker.allow()
+
+    def record_success(self, url: str) -> None:
+        self._guard(url)[2].record_success()
+
+    def record_failure(self, url: str) -> None:
+        host, _, breaker = self._guard(url)
+        was_open = breaker.opened_at is not None
+        breaker.record_failure()
+        if breaker.opened_at is not None and not was_open:
+            logger.warning(f"Circuit opened for {host} after {breaker.consecutive_failures} failures")
+
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        """Return limiter and breaker counters for every domain seen so far."""
+        return {
+            host: {
+                'state': breaker.state,
+                'successes': breaker.successes,
+                'failures': breaker.failures,
+                'rejected': breaker.rejected,
+                'trips': breaker.trips,
+                'granted': bucket.granted,
+                'throttled': bucket.throttled,
+            }
+            for host, (bucket, breaker) in self._guards.items()
+        }
+
+
+domain_guards = DomainGuards()
@@ -4,14 +4,15 @@ Telegram Travel Bot with Geocode, Weather, Flight Search, Currency Conversion,
 Translation, and Multilingual Support
 """
 
+import asyncio
 import configparser
 import io
-import aiohttp
 import logging
-from typing import Optional, Tuple
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
 
-import requests
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, Message
+from telegram.error import TelegramError
 from telegram.ext import (
     ApplicationBuilder, CommandHandler, ContextTypes, CallbackQueryHandler,
     MessageHandler, filters
@@ -20,9 +21,14 @@ from telegram.ext import (
 from registration import reg
 from language_support import (
     get_user_language, set_user_language, translate_string,
-    SUPPORTED_LANGUAGES, detect_language, _
+    SUPPORTED_LANGUAGES, detect_language, translate_batch, _
 )
-from weather_images import create_weather_image
+from weather_images import render_weather_card
+from http_client import HTTP_ERRORS, get_json
+from geocode_cache import GeocodeCache
+from weather_cache import WeatherCache
+from oauth import OAuthTokenManager
+from caching import SingleFlight, TTLCache
 
 # === Configure Logging ===
 logging.basicConfig(
@@ -58,11 +64,22 @@ SKYSCANNER_URL = config['skyscanner']['url']
 EXCHANGE_URL = config['exchange']['url']
 AMADEUS_AUTH_URL = "https://test.api.amadeus.com/v1/security/oauth2/token"
 AMADEUS_FLIGHT_URL = "https://test.api.amadeus.com/v2/shopping/flight-offers"
+
+# === Caches ===
+geocode_cache = GeocodeCache(
+    maxsize=config.getint('cache', 'geocode_size', fallback=1024),
+    ttl=config.getint('cache', 'geocode_ttl', fallback=30 * 24 * 60 * 60),
+)
+
 # === API Helper Functions ===
 
 
-def get_coordinates(location_name: str) -> Optional[Tuple[float, float]]:
+async def get_coordinates(location_name: str) -> Optional[Tuple[float, float]]:
     """Get geographic coordinates for a location name."""
+    cached = await geocode_cache.get(location_name)
+    if cached is not None:
+        return cached
+
     try:
         params = {
             "apikey": YANDEX_API_KEY,
@@ -71,24 +88,23 @@ def get_coordinates(location_name: str) -> Optional[Tuple[float, float]]:
             "lang": "en_US",
             "results": 1
         }
-        response = requests.get(YANDEX_GEOCODER_URL, params=params, timeout=10)
-        response.raise_for_status()
-
-        data = response.json()
+        data = await get_json(YANDEX_GEOCODER_URL, params=params)
         members = data.get("response", {}).get("GeoObjectCollection", {}).get("featureMember", [])
 
         if not members:
             return None
 
         lon, lat = members[0]["GeoObject"]["Point"]["pos"].split()
-        return float(lat), float(lon)
-    except (requests.RequestException, KeyError, ValueError) as e:
+        coords = float(lat), float(lon)
+        await geocode_cache.set(location_name, coords)
+        return coords
+    except (*HTTP_ERRORS, KeyError, ValueError) as e:
         logger.error(f"Geocoding error: {e}")
         return None
 
 
-def get_weather(lat: float, lon: float) -> Optional[Tuple[str, float]]:
-    """Get weather description and temperature for coordinates."""
+async def fetch_weather(lat: float, lon: float) -> Optional[Tuple[str, float]]:
+    """Fetch weather description and temperature for coordinates from OpenWeather."""
     try:
         params = {
             'lat': lat,
@@ -96,33 +112,53 @@ def get_weather(lat: float, lon: float) -> Optional[Tuple[str, float]]:
             'appid': OPENWEATHER_API_KEY,
             'units': 'metric'
         }
-        response = requests.get(OPENWEATHER_URL, params=params, timeout=10)
-        response.raise_for_status()
-
-        data = response.json()
+        data = await get_json(OPENWEATHER_URL, params=params)
         return data['weather'][0]['description'], data['main']['temp']
-    except (requests.RequestException, KeyError, IndexError) as e:
+    except (*HTTP_ERRORS, KeyError, IndexError) as e:
         logger.error(f"Weather API error: {e}")
         return None
 
 
-def get_amadeus_token() -> Optional[str]:
-    try:
-        response = requests.post(AMADEUS_AUTH_URL, data={
-            'grant_type': 'client_credentials',
-            'client_id': AMADEUS_CLIENT_ID,
-            'client_secret': AMADEUS_CLIENT_SECRET,
-        })
-        response.raise_for_status()
-        return response.json()['access_token']
-    except requests.RequestException as e:
-        logger.error(f"Amadeus auth error: {e}")
-        return None
+weather_cache = WeatherCache(
+    fetch_weather,
+    grid=config.getfloat('cache', 'weather_grid', fallback=0.1),
+    ttl=config.getint('cache', 'weather_ttl', fallback=600),
+    stale_ttl=config.getint('cache', 'weather_stale_ttl', fallback=3600),
+    stale_while_revalidate=config.getboolean('cache', 'weather_stale_while_revalidate', fallback=True),
+)
+
+
+async def get_weather(lat: float, lon: float) -> Optional[Tuple[str, float]]:
+    """Get weather description and temperature for coordinates (cached)."""
+    return await weather_cache.get(lat, lon)
+
+
+amadeus_tokens = OAuthTokenManager(AMADEUS_AUTH_URL, AMADEUS_CLIENT_ID, AMADEUS_CLIENT_SECRET)
+
+
+async def get_amadeus_token() -> Optional[str]:
+    """Get the cached Amadeus access token (refreshed shortly before expiry)."""
+    return await amadeus_tokens.get_token()
+
+
+# Offers requested from Amadeus per search: a single-date /flights lists
+# them all, the flexible-date table only shows the cheapest per day
+MAX_FLIGHT_OFFERS = 5
+
+FlightOffer = Tuple[float, bool]
+
 
+def parse_flight_offer(offer: Dict[str, Any]) -> FlightOffer:
+    """Extract (price, is_direct) from an Amadeus flight offer."""
+    price = float(offer['price']['total'])
+    segments = offer['itineraries'][0]['segments']
+    return price, len(segments) == 1
 
-def search_flights(origin: str, dest: str, date: str) -> Optional[Tuple[float, bool]]:
-    """Search flight price and directness using Amadeus API."""
-    token = get_amadeus_token()
+
+async def fetch_flight_offers(origin: str, dest: str, date: str, currency: str,
+                              max_offers: int = MAX_FLIGHT_OFFERS) -> Optional[List[FlightOffer]]:
+    """Search flight offers using Amadeus API, cheapest first (None on error)."""
+    token = await get_amadeus_token()
     if not token:
         return None
 
@@ -132,31 +168,79 @@ def search_flights(origin: str, dest: str, date: str) -> Optional[Tuple[float, b
         "destinationLocationCode": dest,
         "departureDate": date,
         "adults": 1,
-        "currencyCode": "USD",
-        "max": 1
+        "currencyCode": currency,
+        "max": max_offers
     }
 
     try:
-        response = requests.get(AMADEUS_FLIGHT_URL, headers=headers, params=params)
-        response.raise_for_status()
-        data = response.json()
+        try:
+            data = await get_json(AMADEUS_FLIGHT_URL, headers=headers, params=params)
+        except HTTP_ERRORS as e:
+            if getattr(e, 'status', None) != 401:
+                raise
+            # Token revoked before its expiry: fetch a new one and retry once
+            amadeus_tokens.invalidate()
+            token = await get_amadeus_token()
+            if not token:
+                return None
+            headers = {"Authorization": f"Bearer {token}"}
+            data = await get_json(AMADEUS_FLIGHT_URL, headers=headers, params=params)
+
+        offers = [parse_flight_offer(offer) for offer in data.get('data', [])]
+        return sorted(offers, key=lambda offer: offer[0])
+    except (*HTTP_ERRORS, KeyError, IndexError, ValueError) as e:
+        logger.error(f"Flight search error: {e}")
+        return None
 
-        offers = data.get('data', [])
-        if not offers:
-            return None
 
-        offer = offers[0]
-        price = float(offer['price']['total'])
-        segments = offer['itineraries'][0]['segments']
-        is_direct = len(segments) == 1
+# Identical searches share one upstream call and are reused for a few minutes
+flight_cache = TTLCache(
+    maxsize=config.getint('cache', 'flight_size', fallback=256),
+    ttl=config.getint('cache', 'flight_ttl', fallback=300),
+)
+flight_searches = SingleFlight()
 
-        return price, is_direct
-    except (requests.RequestException, KeyError, ValueError) as e:
-        logger.error(f"Flight search error: {e}")
-        return None
 
+async def search_flight_offers(origin: str, dest: str, date: str, currency: str = "USD",
+                               max_offers: int = MAX_FLIGHT_OFFERS) -> List[FlightOffer]:
+    """
+    Search flight offers, answering repeated searches from the cache.
+
+    Concurrent identical searches are coalesced into one Amadeus request.
+
+    Args:
+        origin: Origin IATA code
+        dest: Destination IATA code
+        date: Departure date (YYYY-MM-DD)
+        currency: Price currency code
+        max_offers: How many offers to return (at most MAX_FLIGHT_OFFERS)
 
-def convert_currency(amount: float, frm: str, to: str) -> Optional[float]:
+    Returns:
+        List of (price, is_direct) tuples, cheapest first; empty if none found
+    """
+    key = (origin.upper(), dest.upper(), date, currency.upper())
+    offers = flight_cache.get(key)
+    if offers is None:
+        offers = await flight_searches.do(key, _search_and_cache, key)
+    return offers[:max_offers]
+
+
+async def _search_and_cache(key: Tuple[str, str, str, str]) -> List[FlightOffer]:
+    offers = await fetch_flight_offers(*key)
+    # Failures and empty answers aren't cached, the next search retries
+    if offers:
+        flight_cache.set(key, offers)
+    return offers or []
+
+
+async def search_flights(origin: str, dest: str, date: str,
+                         currency: str = "USD") -> Optional[FlightOffer]:
+    """Search the cheapest flight; returns (price, is_direct) or None."""
+    offers = await search_flight_offers(origin, dest, date, currency, max_offers=1)
+    return offers[0] if offers else None
+
+
+async def convert_currency(amount: float, frm: str, to: str) -> Optional[float]:
     """Convert currency from one type to another using FreeCurrencyAPI."""
     if not EXCHANGE_API_KEY:
         logger.warning("FreeCurrency API key not configured")
@@ -168,9 +252,7 @@ def convert_currency(amount: float, frm: str, to: str) -> Optional[float]:
             "base_currency": frm,
             "currencies": to
         }
-        response = requests.get(EXCHANGE_URL, params=params)
-        response.raise_for_status()
-        data = response.json()
+        data = await get_json(EXCHANGE_URL, params=params)
 
         rate = data['data'].get(to)
         if rate is None:
@@ -178,12 +260,12 @@ def convert_currency(amount: float, frm: str, to: str) -> Optional[float]:
             return None
 
         return amount * rate
-    except (requests.RequestException, KeyError) as e:
+    except (*HTTP_ERRORS, KeyError) as e:
         logger.error(f"Currency conversion error: {e}")
         return None
 
 
-def translate_text(text: str, target_lang: str) -> Optional[str]:
+async def translate_text(text: str, target_lang: str) -> Optional[str]:
     """Translate text using Google Translate (no API key needed for small usage)."""
     try:
         url = config['translation']['google_translation_url']
@@ -204,18 +286,14 @@ def translate_text(text: str, target_lang: str) -> Optional[str]:
             )
         }
 
-        response = requests.get(url, params=params, headers=headers, timeout=10)
-        if response.status_code != 200:
-            logger.error(
-                f"Translation API error: {response.status_code} – {response.text}"
-            )
-            return None
-
-        result = response.json()
+        result = await get_json(url, params=params, headers=headers)
         # result[0] is a list of [ [translatedSegment, originalSegment, …], … ]
         translated = "".join(seg[0] for seg in result[0] if seg[0])
         return translated
 
+    except HTTP_ERRORS as e:
+        logger.error(f"Translation API error: {e}")
+        return None
     except Exception as e:
         logger.error(f"Translation error: {e}")
         return None
@@ -225,37 +303,42 @@ def translate_text(text: str, target_lang: str) -> Optional[str]:
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /start command with options menu."""
-    welcome_msg = await _("Welcome! Choose an option:", update)
+    (welcome_msg, geocode, weather, flights, currency,
+     translate, language, help_text) = await translate_batch([
+        "Welcome! Choose an option:", "Geocode", "Weather", "Flights",
+        "Currency", "Translate", "Language", "Help"
+    ], update)
 
     buttons = [
-        [InlineKeyboardButton(await _("Geocode", update), callback_data='btn_geocode'),
-         InlineKeyboardButton(await _("Weather", update), callback_data='btn_weather')],
-        [InlineKeyboardButton(await _("Flights", update), callback_data='btn_flights'),
-         InlineKeyboardButton(await _("Currency", update), callback_data='btn_currency')],
-        [InlineKeyboardButton(await _("Translate", update), callback_data='btn_translate'),
-         InlineKeyboardButton(await _("Language", update), callback_data='btn_language')],
-        [InlineKeyboardButton(await _("Help", update), callback_data='btn_help')]
+        [InlineKeyboardButton(geocode, callback_data='btn_geocode'),
+         InlineKeyboardButton(weather, callback_data='btn_weather')],
+        [InlineKeyboardButton(flights, callback_data='btn_flights'),
+         InlineKeyboardButton(currency, callback_data='btn_currency')],
+        [InlineKeyboardButton(translate, callback_data='btn_translate'),
+         InlineKeyboardButton(language, callback_data='btn_language')],
+        [InlineKeyboardButton(help_text, callback_data='btn_help')]
     ]
     reply = InlineKeyboardMarkup(buttons)
     await update.message.reply_text(welcome_msg, reply_markup=reply)
 
 
+# Commands listed by /help with the description to translate
+HELP_COMMANDS = {
+    "/start": "Show main menu",
+    "/geocode <location>": "Get coordinates",
+    "/weather <location>": "Get current weather",
+    "/flights <orig> <dest> <YYYY-MM-DD>": "Search cheap flight",
+    "/flights <orig> <dest> <YYYY-MM-DD> <days>": "Compare flights around a date",
+    "/currency <amount> <from> <to>": "Currency conversion",
+    "/translate <lang> <text>": "Translate text",
+    "/language <code>": "Change bot language",
+}
+
+
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /help command with usage information."""
-    help_text = (
-            "/start - " + await _("Show main menu", update) + "\n"
-                                                              "/geocode <location> - " + await _("Get coordinates",
-                                                                                                 update) + "\n"
-                                                                                                           "/weather <location> - " + await _(
-        "Get current weather", update) + "\n"
-                                         "/flights <orig> <dest> <YYYY-MM-DD> - " + await _("Search cheap flight",
-                                                                                            update) + "\n"
-                                                                                                      "/currency <amount> <from> <to> - " + await _(
-        "Currency conversion", update) + "\n"
-                                         "/translate <lang> <text> - " + await _("Translate text", update) + "\n"
-                                                                                                             "/language <code> - " + await _(
-        "Change bot language", update)
-    )
+    descriptions = await translate_batch(HELP_COMMANDS, update)
+    help_text = "\n".join(f"{command} - {text}" for command, text in descriptions.items())
     await update.message.reply_text(help_text)
 
 
@@ -266,7 +349,7 @@ async def geocode_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         return
 
     location = ' '.join(context.args)
-    coords = get_coordinates(location)
+    coords = await get_coordinates(location)
 
     if coords:
         await update.message.reply_text(
@@ -282,51 +365,178 @@ async def weather_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         return
 
     location = ' '.join(context.args)
-    coords = get_coordinates(location)
+    coords = await get_coordinates(location)
 
     if not coords:
         await update.message.reply_text(await _("Location not found.", update))
         return
 
-    weather_info = get_weather(*coords)
+    weather_info = await get_weather(*coords)
     if weather_info:
         description, temp = weather_info
 
-        # Create weather image
-        image_bio = create_weather_image(location, description, temp)
-        image_bio.name = 'weather.png'
+        # Create weather image (or reuse an identical one already uploaded)
+        card = render_weather_card(location, description, temp)
+        if card.file_id:
+            photo = card.file_id
+        else:
+            photo = io.BytesIO(card.png)
+            photo.name = 'weather.png'
 
         # Send image with translated caption
-        await update.message.reply_photo(
-            photo=image_bio,
+        message = await update.message.reply_photo(
+            photo=photo,
             caption=f"{location}: {await _(description, update)}, {temp}°C"
         )
+        if not card.file_id and message.photo:
+            card.file_id = message.photo[-1].file_id
     else:
         await update.message.reply_text(
             await _("Could not retrieve weather information.", update)
         )
 
 
+# Flexible-date /flights: largest ± window, parallel searches, pause between message edits
+FLEX_MAX_DAYS = 7
+FLEX_PARALLELISM = 4
+FLEX_EDIT_INTERVAL = 1.0
+
+FLIGHT_LABELS = {
+    'usage': "Usage: /flights <orig> <dest> <YYYY-MM-DD>",
+    'flex_usage': "Flexible dates: /flights <orig> <dest> <YYYY-MM-DD> <days>",
+    'searching': "Searching flights...",
+    'cheapest': "Cheapest:",
+    'other': "Other offers:",
+    'direct': "Direct:",
+    'yes': "Yes",
+    'no': "No",
+    'none': "No flight quotes available.",
+}
+
+
+def _flight_text(offer: FlightOffer, labels: Dict[str, str]) -> str:
+    price, is_direct = offer
+    direct_text = labels['yes'] if is_direct else labels['no']
+    return f"{labels['cheapest']} ${price}, {labels['direct']} {direct_text}"
+
+
+def _offers_text(offers: List[FlightOffer], labels: Dict[str, str]) -> str:
+    """Cheapest offer first, then the remaining ones as a short list."""
+    lines = [_flight_text(offers[0], labels)]
+    if len(offers) > 1:
+        lines.append(labels['other'])
+        for price, is_direct in offers[1:]:
+            direct_text = labels['yes'] if is_direct else labels['no']
+            lines.append(f"• ${price}, {labels['direct']} {direct_text}")
+    return "\n".join(lines)
+
+
+def _flex_dates(center: str, days: str) -> Optional[List[str]]:
+    """Dates within ±days of center, skipping the past; None if the input is invalid."""
+    try:
+        center_date = datetime.strptime(center, "%Y-%m-%d").date()
+        days = int(days)
+    except ValueError:
+        return None
+    if not 1 <= days <= FLEX_MAX_DAYS:
+        return None
+    today = datetime.now().date()
+    window = (center_date + timedelta(days=offset) for offset in range(-days, days + 1))
+    return [day.isoformat() for day in window if day >= today]
+
+
+def _render_flex(origin: str, destination: str, dates: List[str],
+                 results: Dict[str, Optional[FlightOffer]], labels: Dict[str, str]) -> str:
+    """Render the flexible-date table; dates still being searched show '…'."""
+    lines = [f"{origin.upper()} → {destination.upper()}"]
+    if len(results) < len(dates):
+        lines.append(f"{labels['searching']} {len(results)}/{len(dates)}")
+    for day in dates:
+        if day not in results:
+            lines.append(f"{day}: …")
+        elif results[day] is None:
+            lines.append(f"{day}: —")
+        else:
+            lines.append(f"{day}: {_flight_text(results[day], labels)}")
+
+    found = [(offer[0], day) for day, offer in results.items() if offer is not None]
+    if len(results) == len(dates):
+        if found:
+            price, day = min(found)
+            lines.append(f"\n{labels['cheapest']} {day}, ${price}")
+        else:
+            lines.append(f"\n{labels['none']}")
+    return "\n".join(lines)
+
+
+async def _edit_progress(message: Message, text: str) -> None:
+    try:
+        await message.edit_text(text)
+    except TelegramError as e:
+        # "Message is not modified", flood control, ...: the next edit catches up
+        logger.debug(f"Progress edit skipped: {e}")
+
+
+async def flexible_flights(update: Update, origin: str, destination: str,
+                           dates: List[str], labels: Dict[str, str]) -> None:
+    """
+    Search every date concurrently and stream results into one message.
+
+    At most FLEX_PARALLELISM searches run at once; while results are
+    pending the message is redrawn every FLEX_EDIT_INTERVAL seconds if
+    anything new arrived, so no result waits for the next completion.
+    """
+    results: Dict[str, Optional[FlightOffer]] = {}
+    message = await update.message.reply_text(_render_flex(origin, destination, dates, results, labels))
+    semaphore = asyncio.Semaphore(FLEX_PARALLELISM)
+
+    async def search_day(day: str) -> Tuple[str, Optional[FlightOffer]]:
+        async with semaphore:
+            return day, await search_flights(origin, destination, day)
+
+    async def redraw() -> None:
+        drawn = 0
+        while True:
+            await asyncio.sleep(FLEX_EDIT_INTERVAL)
+            if len(results) != drawn:
+                drawn = len(results)
+                await _edit_progress(message, _render_flex(origin, destination, dates, results, labels))
+
+    redrawer = asyncio.create_task(redraw())
+    try:
+        for next_done in asyncio.as_completed([search_day(day) for day in dates]):
+            day, offer = await next_done
+            results[day] = offer
+    finally:
+        redrawer.cancel()
+        # Let an in-flight progress edit settle before the final one
+        await asyncio.gather(redrawer, return_exceptions=True)
+
+    await _edit_progress(message, _render_flex(origin, destination, dates, results, labels))
+
+
 async def flights_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Handle /flights command."""
-    if len(context.args) != 3:
-        await update.message.reply_text(
-            await _("Usage: /flights <orig> <dest> <YYYY-MM-DD>", update)
-        )
+    """Handle /flights command (one date, or a flexible ±days window)."""
+    labels = await translate_batch(FLIGHT_LABELS, update)
+    usage = f"{labels['usage']}\n{labels['flex_usage']}"
+    if len(context.args) not in (3, 4):
+        await update.message.reply_text(usage)
         return
 
-    origin, destination, date = context.args
-    flight_info = search_flights(origin, destination, date)
+    origin, destination, date = context.args[:3]
+    if len(context.args) == 4:
+        dates = _flex_dates(date, context.args[3])
+        if not dates:
+            await update.message.reply_text(usage)
+            return
+        await flexible_flights(update, origin, destination, dates, labels)
+        return
 
-    if flight_info:
-        price, is_direct = flight_info
-        direct_text = await _("Yes", update) if is_direct else await _("No", update)
-        await update.message.reply_text(
-            (await _("Cheapest:", update)) + f" ${price}, " +
-            (await _("Direct:", update)) + f" {direct_text}"
-        )
+    offers = await search_flight_offers(origin, destination, date)
+    if offers:
+        await update.message.reply_text(_offers_text(offers, labels))
     else:
-        await update.message.reply_text(await _("No flight quotes available.", update))
+        await update.message.reply_text(labels['none'])
 
 
 async def currency_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -342,7 +552,7 @@ async def currency_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         from_currency = context.args[1].upper()
         to_currency = context.args[2].upper()
 
-        result = convert_currency(amount, from_currency, to_currency)
+        result = await convert_currency(amount, from_currency, to_currency)
 
         if result is not None:
             await update.message.reply_text(
@@ -368,7 +578,7 @@ async def translate_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
     target_lang = context.args[0]
     text = ' '.join(context.args[1:])
 
-    translation = translate_text(text, target_lang)
+    translation = await translate_text(text, target_lang)
 
     if translation:
         await update.message.reply_text(
@@ -419,22 +629,26 @@ async def language_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         )
 
 
+# Hints sent for each main-menu button ('unknown' for anything else)
+BUTTON_RESPONSES = {
+    'btn_geocode': "Type /geocode <location>",
+    'btn_weather': "Type /weather <location>",
+    'btn_flights': "Type /flights <orig> <dest> <YYYY-MM-DD>",
+    'btn_currency': "Type /currency <amount> <from> <to>",
+    'btn_translate': "Type /translate <lang> <text>",
+    'btn_language': "Type /language <code> to change language",
+    'btn_help': "Type /help",
+    'unknown': "Command not recognized",
+}
+
+
 async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle button clicks in the interface."""
     query = update.callback_query
     await query.answer()
 
-    button_responses = {
-        'btn_geocode': await _("Type /geocode <location>", update),
-        'btn_weather': await _("Type /weather <location>", update),
-        'btn_flights': await _("Type /flights <orig> <dest> <YYYY-MM-DD>", update),
-        'btn_currency': await _("Type /currency <amount> <from> <to>", update),
-        'btn_translate': await _("Type /translate <lang> <text>", update),
-        'btn_language': await _("Type /language <code> to change language", update),
-        'btn_help': await _("Type /help", update)
-    }
-
-    response = button_responses.get(query.data, await _("Command not recognized", update))
+    button_responses = await translate_batch(BUTTON_RESPONSES, update)
+    response = button_responses.get(query.data, button_responses['unknown'])
     await query.message.reply_text(response)
 
 
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Weather response cache for the Telegram Travel Bot.
+Current conditions are cached per coordinate grid cell; in
+stale-while-revalidate mode an expired entry is served immediately while
+a background task fetches a fresh one.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from caching import TTLCache
+
+# === Logging ===
+logger = logging.getLogger(__name__)
+
+# === Constants ===
+# Defaults, overridable through the [cache] section of config.ini
+DEFAULT_GRID = 0.1  # degrees, roughly 10 km
+DEFAULT_TTL = 10 * 60  # entries younger than this are fresh
+DEFAULT_STALE_TTL = 60 * 60  # stale entries may be served up to this age
+DEFAULT_MAXSIZE = 512
+
+WeatherInfo = Tuple[str, float]
+WeatherFetcher = Callable[[float, float], Awaitable[Optional[WeatherInfo]]]
+
+
+class WeatherCache:
+    """Cache of (description, temperature) keyed by rounded coordinates."""
+
+    def __init__(self, fetcher: WeatherFetcher, grid: float = DEFAULT_GRID,
+                 ttl: float = DEFAULT_TTL, stale_ttl: float = DEFAULT_STALE_TTL,
+                 stale_while_revalidate: bool = True, maxsize: int = DEFAULT_MAXSIZE):
+        self.fetcher = fetcher
+        self.grid = grid
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        # Entries are kept for the stale window; freshness is checked separately
+        self.entries = TTLCache(maxsize=maxsize,
+                                ttl=max(ttl, stale_ttl) if stale_while_revalidate else ttl)
+        self.stale_hits = 0
+        # Running refresh tasks; also keeps a reference so they aren't GC'd
+        self._refreshing: Dict[Tuple[int, int], asyncio.Task] = {}
+
+    def key(self, lat: float, lon: float) -> Tuple[int, int]:
+        """Snap coordinates to the grid cell they fall into."""
+        return round(lat / self.grid), round(lon / self.grid)
+
+    async def get(self, lat: float, lon: float) -> Optional[WeatherInfo]:
+        """
+        Get weather for coordinates, using the cache when possible.
+
+        Args:
+            lat: Latitude
+            lon: Longitude
+
+        Returns:
+            (description, temperature) tuple, or None if the upstream call failed
+        """
+        key = self.key(lat, lon)
+        entry = self.entries.get(key)
+        if entry is not None:
+            weather, fetched_at = entry
+            if time.monotonic() - fetched_at < self.ttl:
+                return weather
+            # Still inside the stale window: answer now, refresh in background
+            self.stale_hits += 1
+            self._schedule_refresh(key, lat, lon)
+            return weather
+
+        return await self._fetch(key, lat, lon)
+
+    async def _fetch(self, key: Tuple[int, int], lat: float, lon: float) -> Optional[WeatherInfo]:
+        """Call the upstream fetcher and store a successful result."""
+        weather = await self.fetcher(lat, lon)
+        if weather is not None:
+            self.entries.set(key, (weather, time.monotonic()))
+        return weather
+
+    def _schedule_refresh(self, key: Tuple[int, int], lat: float, lon: float) -> None:
+        """Start one background refresh per grid cell."""
+        if key in self._refreshing:
+            return
+
+        task = asyncio.create_task(self._fetch(key, lat, lon))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda t: self._on_refreshed(key, t))
+
+    def _on_refreshed(self, key: Tuple[int, int], task: asyncio.Task) -> None:
+        self._refreshing.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Background weather refresh failed: {task.exception()}")
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters."""
+        return {**self.entries.stats(), 'stale_hits': self.stale_hits}
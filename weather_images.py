@@ -5,8 +5,13 @@ This module creates weather visualizations using PIL (Pillow).
 
 import io
 import datetime
+import hashlib
+from collections import OrderedDict
 from PIL import Image, ImageDraw, ImageFont
 
+# Upper bound for the memory held by rendered cards
+CARD_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
 # Weather symbol mapping (using text-based symbols that work well with PIL)
 WEATHER_SYMBOLS = {
     'clear': 'SUN',
@@ -214,101 +219,198 @@ def draw_weather_icon(draw, weather_type, x, y, size):
         draw_cloud(draw, x, y, size)
 
 
-def create_weather_image(location, description, temp, date=None):
-    """Create weather visualization using PIL."""
-    # Set current date if not provided
+class RenderedCard:
+    """PNG bytes of a rendered weather card and its Telegram file_id once uploaded."""
+
+    def __init__(self, key, png):
+        self.key = key
+        self.png = png
+        self.file_id = None
+
+
+class CardCache:
+    """Content-addressed LRU of rendered cards, bounded by total PNG size."""
+
+    def __init__(self, max_bytes=CARD_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._cards = OrderedDict()
+
+    def get(self, key):
+        """Return the cached card for key or None."""
+        card = self._cards.get(key)
+        if card is None:
+            self.misses += 1
+            return None
+        self._cards.move_to_end(key)
+        self.hits += 1
+        return card
+
+    def put(self, key, png):
+        """Store rendered PNG bytes, evicting least recently used cards."""
+        card = RenderedCard(key, png)
+        old = self._cards.pop(key, None)
+        if old is not None:
+            self.size -= len(old.png)
+        self._cards[key] = card
+        self.size += len(png)
+        while self.size > self.max_bytes and len(self._cards) > 1:
+            _, evicted = self._cards.popitem(last=False)
+            self.size -= len(evicted.png)
+        return card
+
+    def stats(self):
+        """Return hit/miss counters and memory usage."""
+        return {'hits': self.hits, 'misses': self.misses,
+                'cards': len(self._cards), 'bytes': self.size}
+
+
+card_cache = CardCache()
+
+
+def card_key(location, description, temp, date):
+    """Build the content address of a card from everything drawn on it."""
+    raw = "\x1f".join((location, description, str(temp), date))
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def render_weather_card(location, description, temp, date=None):
+    """Return the cached card for these values, rendering it on a miss."""
     if date is None:
         date = datetime.datetime.now().strftime("%B %d, %Y")
 
-    # Image dimensions
-    width, height = 500, 300
+    key = card_key(location, description, temp, date)
+    card = card_cache.get(key)
+    if card is None:
+        card = card_cache.put(key, renderer.render(location, description, temp, date))
+    return card
+
 
-    # Get background color based on weather
-    bg_color = get_background_color(description)
+def create_weather_image(location, description, temp, date=None):
+    """Create weather visualization using PIL."""
+    return io.BytesIO(render_weather_card(location, description, temp, date).png)
 
-    # Create a new image with the background color
-    image = Image.new('RGB', (width, height), bg_color)
-    draw = ImageDraw.Draw(image)
 
+def _load_fonts():
+    """Resolve and load the card fonts (title, large, medium, small)."""
     # Try to load fonts - use default if not available
     try:
         # For Windows
-        title_font = ImageFont.truetype("arial.ttf", 32)
-        large_font = ImageFont.truetype("arial.ttf", 48)
-        medium_font = ImageFont.truetype("arial.ttf", 24)
-        small_font = ImageFont.truetype("arial.ttf", 18)
+        return (ImageFont.truetype("arial.ttf", 32),
+                ImageFont.truetype("arial.ttf", 48),
+                ImageFont.truetype("arial.ttf", 24),
+                ImageFont.truetype("arial.ttf", 18))
     except IOError:
-        try:
-            # For Linux
-            title_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 32)
-            large_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 48)
-            medium_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 24)
-            small_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 18)
-        except IOError:
-            # Fall back to default
-            title_font = ImageFont.load_default()
-            large_font = ImageFont.load_default()
-            medium_font = ImageFont.load_default()
-            small_font = ImageFont.load_default()
-
-    # Draw gradient for the upper part of the image
-    for y in range(height // 2):
-        # Create a gradient effect
-        opacity = int(150 - y * 0.6)  # Decreasing opacity as y increases
-        if opacity > 0:
-            # Draw a semi-transparent line
-            color = (255, 255, 255, min(opacity, 255))
-            draw.line([(0, y), (width, y)], fill=color)
-
-    # Draw weather icon in the upper part
-    icon_x, icon_y = width // 2, height // 4
-    icon_size = 50
-    draw_weather_icon(draw, description, icon_x, icon_y, icon_size)
-
-    # Draw a white info box at the bottom
-    overlay_height = 130
-    draw.rectangle([(0, height - overlay_height), (width, height)], fill=(255, 255, 255))
-
-    # Draw location in larger font
-    draw.text((20, height - overlay_height + 15), location, font=title_font, fill=(0, 0, 0))
+        pass
+    try:
+        # For Linux
+        return (ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 32),
+                ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 48),
+                ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 24),
+                ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 18))
+    except IOError:
+        # Fall back to default
+        default_font = ImageFont.load_default()
+        return default_font, default_font, default_font, default_font
 
-    # Draw description
-    draw.text((20, height - overlay_height + 60), description, font=medium_font, fill=(50, 50, 50))
 
-    # Draw temperature in large font
-    temp_text = f"{temp}°C"
-    # Get text dimensions using the appropriate method
+def _text_size(draw, text, font, fallback):
+    """Get text dimensions using the method available in this Pillow version."""
     if hasattr(draw, 'textbbox'):
         # For newer Pillow versions (>=8.0.0)
-        bbox = draw.textbbox((0, 0), temp_text, font=large_font)
-        w, h = bbox[2] - bbox[0], bbox[3] - bbox[1]
+        bbox = draw.textbbox((0, 0), text, font=font)
+        return bbox[2] - bbox[0], bbox[3] - bbox[1]
     elif hasattr(draw, 'textsize'):
         # For older Pillow versions (<8.0.0)
-        w, h = draw.textsize(temp_text, font=large_font)
-    else:
-        # Fallback if neither method is available
-        w, h = large_font.getsize(temp_text) if hasattr(large_font, 'getsize') else (120, 48)
+        return draw.textsize(text, font=font)
+    # Fallback if neither method is available
+    return font.getsize(text) if hasattr(font, 'getsize') else fallback
 
-    draw.text((width - w - 30, height - overlay_height + 30), temp_text, font=large_font, fill=(0, 0, 0))
 
-    # Draw date
-    draw.text((20, height - 30), date, font=small_font, fill=(50, 50, 50))
+class WeatherCardRenderer:
+    """
+    Draws weather cards from fonts and background layers prepared once.
 
-    # Draw "Powered by TravelBot"
-    powered_by_text = "Powered by TravelBot"
-    if hasattr(draw, 'textbbox'):
-        bbox = draw.textbbox((0, 0), powered_by_text, font=small_font)
-        w_powered = bbox[2] - bbox[0]
-    elif hasattr(draw, 'textsize'):
-        w_powered, _ = draw.textsize(powered_by_text, font=small_font)
-    else:
-        w_powered = small_font.getsize(powered_by_text)[0] if hasattr(small_font, 'getsize') else 150
+    Everything that doesn't depend on the request (gradient, info box,
+    "Powered by" footer) is pre-rendered for each background color, so a
+    card only needs a copy of its base plus the icon and text.
+    """
 
-    draw.text((width - w_powered - 20, height - 30), powered_by_text, font=small_font, fill=(100, 100, 100))
-
-    # Save image to a BytesIO object
-    bio = io.BytesIO()
-    image.save(bio, 'PNG')
-    bio.seek(0)
+    width, height = 500, 300
+    overlay_height = 130
 
-    return bio
\ No newline at end of file
+    def __init__(self):
+        self.title_font, self.large_font, self.medium_font, self.small_font = _load_fonts()
+        self._bases = {}
+        for color in set(WEATHER_COLORS.values()):
+            self._bases[color] = self._build_base(color)
+
+    def _build_base(self, bg_color):
+        """Pre-render the static layers over one background color."""
+        width, height = self.width, self.height
+        image = Image.new('RGB', (width, height), bg_color)
+        draw = ImageDraw.Draw(image)
+
+        # Draw gradient for the upper part of the image
+        for y in range(height // 2):
+            # Create a gradient effect
+            opacity = int(150 - y * 0.6)  # Decreasing opacity as y increases
+            if opacity > 0:
+                # Draw a semi-transparent line
+                color = (255, 255, 255, min(opacity, 255))
+                draw.line([(0, y), (width, y)], fill=color)
+
+        # Draw a white info box at the bottom
+        draw.rectangle([(0, height - self.overlay_height), (width, height)], fill=(255, 255, 255))
+
+        # Draw "Powered by TravelBot"
+        powered_by_text = "Powered by TravelBot"
+        w_powered, _ = _text_size(draw, powered_by_text, self.small_font, (150, 18))
+        draw.text((width - w_powered - 20, height - 30), powered_by_text,
+                  font=self.small_font, fill=(100, 100, 100))
+        return image
+
+    def base_for(self, bg_color):
+        """Return the prebuilt base for a background color, building it if new."""
+        base = self._bases.get(bg_color)
+        if base is None:
+            base = self._bases[bg_color] = self._build_base(bg_color)
+        return base
+
+    def render(self, location, description, temp, date):
+        """Draw the weather card and return it PNG-encoded."""
+        width, height = self.width, self.height
+        overlay_height = self.overlay_height
+
+        # Start from the static layers for this weather's background
+        image = self.base_for(get_background_color(description)).copy()
+        draw = ImageDraw.Draw(image)
+
+        # Draw weather icon in the upper part
+        icon_x, icon_y = width // 2, height // 4
+        icon_size = 50
+        draw_weather_icon(draw, description, icon_x, icon_y, icon_size)
+
+        # Draw location in larger font
+        draw.text((20, height - overlay_height + 15), location, font=self.title_font, fill=(0, 0, 0))
+
+        # Draw description
+        draw.text((20, height - overlay_height + 60), description, font=self.medium_font, fill=(50, 50, 50))
+
+        # Draw temperature in large font
+        temp_text = f"{temp}°C"
+        w, h = _text_size(draw, temp_text, self.large_font, (120, 48))
+        draw.text((width - w - 30, height - overlay_height + 30), temp_text, font=self.large_font, fill=(0, 0, 0))
+
+        # Draw date
+        draw.text((20, height - 30), date, font=self.small_font, fill=(50, 50, 50))
+
+        # Encode image to PNG bytes
+        bio = io.BytesIO()
+        image.save(bio, 'PNG')
+        return bio.getvalue()
+
+
+renderer = WeatherCardRenderer()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Zodiac sign resolver for the Telegram Travel Bot.
+Maps a birthday to the znak_zodiac_id used in the logining table with a
+precomputed day-of-year lookup table, one per gender lexicon.
+"""
+
+import logging
+from typing import List, Optional
+
+from database import db
+
+# === Logging ===
+logger = logging.getLogger(__name__)
+
+# === Constants ===
+# Sign numbers match zodiac_idshnik.zodiac_id
+SIGN_NAMES = {
+    1: 'Capricorn',
+    2: 'Aquarius',
+    3: 'Pisces',
+    4: 'Aries',
+    5: 'Taurus',
+    6: 'Gemini',
+    7: 'Cancer',
+    8: 'Leo',
+    9: 'Virgo',
+    10: 'Libra',
+    11: 'Scorpio',
+    12: 'Sagittarius',
+}
+
+# Last day (month, day) of each sign, in calendar order starting from January
+SIGN_ENDS = (
+    ((1, 20), 1),
+    ((2, 18), 2),
+    ((3, 20), 3),
+    ((4, 19), 4),
+    ((5, 20), 5),
+    ((6, 21), 6),
+    ((7, 22), 7),
+    ((8, 22), 8),
+    ((9, 22), 9),
+    ((10, 23), 10),
+    ((11, 22), 11),
+    ((12, 21), 12),
+    ((12, 31), 1),
+)
+
+# sign number -> znak_zodiac_id, per gender
+man_lexicon = {sign: sign for sign in SIGN_NAMES}
+woman_lexicon = {sign: sign + 12 for sign in SIGN_NAMES}
+cat_lexicon = {sign: sign + 24 for sign in SIGN_NAMES}
+LEXICONS = {
+    'man': man_lexicon,
+    'woman': woman_lexicon,
+    'bread': cat_lexicon,
+}
+
+# Gender values written by older registration code -> lexicon key
+GENDER_ALIASES = {
+    'male': 'man',
+    'female': 'woman',
+}
+
+# Days in each month of a leap year, so 29 February has its own slot
+_MONTH_DAYS = (31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+_MONTH_OFFSETS = [sum(_MONTH_DAYS[:i]) for i in range(12)]
+
+
+def _build_sign_table() -> List[int]:
+    """Sign number for each of the 366 days of a leap year (index 0 = 1 January)."""
+    table = []
+    for (month, day), sign in SIGN_ENDS:
+        end = _MONTH_OFFSETS[month - 1] + day
+        table.extend([sign] * (end - len(table)))
+    return table
+
+
+SIGN_BY_DAY = _build_sign_table()
+ZODIAC_ID_BY_DAY = {
+    gender: [lexicon[sign] for sign in SIGN_BY_DAY]
+    for gender, lexicon in LEXICONS.items()
+}
+
+
+def day_of_year(day: int, month: int) -> Optional[int]:
+    """0-based day of a leap year, or None for an impossible date."""
+    if not 1 <= month <= 12 or not 1 <= day <= _MONTH_DAYS[month - 1]:
+        return None
+    return _MONTH_OFFSETS[month - 1] + day - 1
+
+
+def zodiac_sign(day: int, month: int) -> Optional[int]:
+    """Get the sign number (see SIGN_NAMES) for a birthday."""
+    index = day_of_year(day, month)
+    return None if index is None else SIGN_BY_DAY[index]
+
+
+def lexicon_key(gender: Optional[str]) -> Optional[str]:
+    """Lexicon key for a stored gender ('Male' -> 'man'), or None if unknown."""
+    if not isinstance(gender, str):
+        return None
+    key = gender.strip().lower()
+    key = GENDER_ALIASES.get(key, key)
+    return key if key in LEXICONS else None
+
+
+def zodiac_id(gender: str, day: int, month: int) -> Optional[int]:
+    """
+    Get znak_zodiac_id for a gender and birthday.
+
+    Args:
+        gender: 'man', 'woman' or 'bread' (legacy 'Male'/'Female' accepted)
+        day: Day of month
+        month: Month number
+
+    Returns:
+        znak_zodiac_id, or None for an unknown gender or impossible date
+    """
+    table = ZODIAC_ID_BY_DAY.get(lexicon_key(gender))
+    index = day_of_year(day, month)
+    if table is None or index is None:
+        return None
+    return table[index]
+
+
+async def assign_zodiac_ids(only_missing: bool = False) -> int:
+    """
+    Recompute znak_zodiac_id for rows in logining.
+
+    Rows are read with one SELECT and written back with one executemany;
+    rows that can't be resolved are logged with the reason and skipped.
+
+    Args:
+        only_missing: Only fill rows whose znak_zodiac_id is NULL
+            (consistency check for rows registered before it was stored)
+
+    Returns:
+        Number of rows updated
+
+    Raises:
+        sqlite3.Error: if a query fails
+    """
+    sql = 'SELECT id, gender, day, month FROM logining'
+    if only_missing:
+        sql += ' WHERE znak_zodiac_id IS NULL'
+    rows = await db.fetchall(sql)
+    updates = []
+    for row_id, gender, day, month in rows:
+        if lexicon_key(gender) is None:
+            logger.warning(f"logining row {row_id}: unknown gender {gender!r}, zodiac not assigned")
+            continue
+        if not isinstance(day, int) or not isinstance(month, int) or day_of_year(day, month) is None:
+            logger.warning(f"logining row {row_id}: invalid birthday {day!r}.{month!r}, zodiac not assigned")
+            continue
+        updates.append((zodiac_id(gender, day, month), row_id))
+    if not updates:
+        return 0
+    return await db.executemany(
+        'UPDATE logining SET znak_zodiac_id = ? WHERE id = ?',
+        updates
+    )
+
+
+if __name__ == '__main__':
+    # Backfill after bulk imports: python zodiac.py
+    import asyncio
+
+    updated = asyncio.run(assign_zodiac_ids())
+    db.close()
+    print(f"Знак зодиака назначен для {updated} записей")